@@ -4,9 +4,14 @@
 # Tower of Hanoi puzzle with a variation.Allow starting from any valid initial state and always move all disks to the rightmost pole.
 # -------------------------------------------------------------------------------------
 import pygame
+import os
 import sys
 import random
 
+# The shared solvers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from hanoi_bfs import bfs_solution
+
 # Constants
 WIDTH, HEIGHT = 800, 600
 POLE_COUNT = 3
@@ -73,37 +78,8 @@ class TowerOfHanoi:
     # ----------------------------------------
     def solve(self):
         # BFS: Find shortest move sequence from current state to all disks on rightmost pole in correct order
-        from collections import deque
-        start = tuple(tuple(p) for p in self.poles)
-        goal = tuple(() for _ in range(POLE_COUNT-1)) + (tuple(range(self.disk_count, 0, -1)),)
-        visited = set()
-        queue = deque()
-        queue.append((start, []))
-        visited.add(start)
-
-        while queue:
-            state, moves = queue.popleft()
-            if state == goal:
-                self.solution = moves
-                self.solution_step = 0
-                return
-            for src in range(POLE_COUNT):
-                if not state[src]:
-                    continue
-                disk = state[src][-1]
-                for dst in range(POLE_COUNT):
-                    if src == dst:
-                        continue
-                    if not state[dst] or state[dst][-1] > disk:
-                        # perform move
-                        new_state = [list(p) for p in state]
-                        new_state[dst].append(new_state[src].pop())
-                        new_state_tuple = tuple(tuple(p) for p in new_state)
-                        if new_state_tuple not in visited:
-                            visited.add(new_state_tuple)
-                            queue.append((new_state_tuple, moves + [(src, dst)]))
-        # Fail-safe: no solution found
-        self.solution = []
+        # Whole layers are expanded at once with NumPy (see hanoi_bfs.py)
+        self.solution = bfs_solution(self.poles, self.disk_count)
         self.solution_step = 0
     # ----------------------------------------
     def make_next_move(self):
@@ -0,0 +1,195 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Benchmark suite for the solvers and the renderer, with machine-readable output.
+# 1) Solvers: time and peak memory (tracemalloc) of HanoiCore.calculate_optimal_moves,
+#    HanoiCore.prepare_auto_solve, streaming its moves (prepare_auto_solve is lazy, so the
+#    move generation is timed separately) and TowerOfHanoi.solve (Other/) over disk counts and seeds.
+# 2) Renderer: headless HanoiGame.draw frame times (p50/p99), full redraws and incremental
+#    frames during an animated auto-solve.
+# Results are written as JSON; given a baseline file from an earlier run, every result
+# slower (or bigger) than the baseline by more than the thresholds below is reported as a
+# regression and the exit code is 1. Times are compared by their median, and a slowdown also
+# has to clear the noise band of the case: NOISE_FACTOR times the spread (interquartile range)
+# of its samples, so cases that jitter a lot on this machine need a bigger change to be flagged.
+# Usage: python hanoi_benchmark.py [output.json|-] [baseline.json]
+# -------------------------------------------------------------------------------------
+import collections
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from hanoi_core import HanoiCore
+
+TIME_THRESHOLD = 0.25     # Regression when the median is more than 25% slower than the baseline...
+MIN_TIME_DELTA = 0.0002   # ... and slower by more than this many seconds (timer noise)...
+NOISE_FACTOR = 3.0        # ... and by more than this many times the larger spread of the two runs
+MEMORY_THRESHOLD = 0.10   # Regression when peak memory grows by more than 10%...
+MIN_MEMORY_DELTA = 4096   # ... and by more than this many bytes
+
+REPEATS = 15  # Timed calls per solver case, in as many rounds over all cases
+SEEDS = (0, 1, 2)
+SOLVER_CASES = [(3, n) for n in (3, 5, 8, 12, 20, 40, 60)] + [(4, n) for n in (5, 8)] + [(5, 8)]
+STREAM_MOVES = 100_000  # Moves drained from the auto-solve stream (the whole solution when shorter)
+CLASSIC_SOLVE_DISKS = (3, 5, 7)  # TowerOfHanoi.solve searches the full state space
+DRAW_DISKS = (3, 5, 8)
+DRAW_FRAMES = 300
+# -------------------------------------------------------------------------------------
+def time_stats(times: List[float]) -> Dict[str, float]:
+    """Best time, median and spread (interquartile range) of timing samples"""
+    quartiles = statistics.quantiles(times, n=4) if len(times) > 1 else [times[0]] * 3
+    return {"seconds": min(times), "median_seconds": statistics.median(times),
+            "spread_seconds": quartiles[2] - quartiles[0]}
+# -------------------------------------------------------------------------------------
+def measure(cases: List[Tuple[dict, Callable[[], object]]], repeats: int = REPEATS) -> List[dict]:
+    """
+    Time every (result, function) case `repeats` times, one call per case per round, so a slow
+    spell of the machine costs each case one sample instead of all of them. Each result gets
+    its time statistics (see time_stats) and the peak traced memory of one more call.
+    """
+    times = [[] for _ in cases]
+    for _ in range(repeats):
+        for (_, function), samples in zip(cases, times):
+            started = time.perf_counter()
+            function()
+            samples.append(time.perf_counter() - started)
+
+    results = []
+    for (result, function), samples in zip(cases, times):
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        results.append({**result, **time_stats(samples), "peak_bytes": peak})
+    return results
+# -------------------------------------------------------------------------------------
+def seeded_core(pole_count: int, disk_count: int, seed: int) -> HanoiCore:
+    random.seed(seed)
+    return HanoiCore(disk_count, pole_count)
+# -------------------------------------------------------------------------------------
+def solver_benchmarks() -> List[dict]:
+    cases = []
+    for pole_count, disk_count in SOLVER_CASES:
+        for seed in SEEDS:
+            core = seeded_core(pole_count, disk_count, seed)
+            case = {"poles": pole_count, "disks": disk_count, "seed": seed, "optimal_moves": core.optimal_moves}
+            cases.append(({"name": "calculate_optimal_moves", **case}, core.calculate_optimal_moves))
+            cases.append(({"name": "prepare_auto_solve", **case}, core.prepare_auto_solve))
+
+            def stream_moves(core=core):
+                core.prepare_auto_solve()
+                collections.deque(itertools.islice(core.move_sequence, STREAM_MOVES), maxlen=0)
+
+            cases.append(({"name": "auto_solve_stream", **case, "moves": min(STREAM_MOVES, core.optimal_moves)},
+                          stream_moves))
+
+    # The BFS solver of the alternative game in Other/
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Other"))
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from other_hanoi_pygame import TowerOfHanoi
+    for disk_count in CLASSIC_SOLVE_DISKS:
+        for seed in SEEDS:
+            random.seed(seed)
+            game = TowerOfHanoi(disk_count)
+
+            def solve(game=game, state=game.get_state()):
+                game.set_state(state)
+                game.solve()
+
+            cases.append(({"name": "TowerOfHanoi.solve", "poles": 3, "disks": disk_count, "seed": seed}, solve))
+    return measure(cases)
+# -------------------------------------------------------------------------------------
+def draw_benchmarks() -> List[dict]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import hanoi_pygame
+
+    screen = pygame.display.set_mode((hanoi_pygame.SCREEN_WIDTH, hanoi_pygame.SCREEN_HEIGHT))
+    results = []
+    for disk_count in DRAW_DISKS:
+        for seed in SEEDS:
+            random.seed(seed)
+            game = hanoi_pygame.HanoiGame(disk_count)
+
+            # Full redraws of a static board
+            full = []
+            for _ in range(DRAW_FRAMES):
+                game.invalidate()
+                started = time.perf_counter()
+                game.draw(screen)
+                full.append(time.perf_counter() - started)
+
+            # Incremental frames while the auto-solve animates, stepping the simulation per frame
+            game.set_mode("auto")
+            incremental = []
+            for _ in range(DRAW_FRAMES):
+                game.step()
+                started = time.perf_counter()
+                game.draw(screen)
+                incremental.append(time.perf_counter() - started)
+
+            case = {"poles": game.pole_count, "disks": disk_count, "seed": seed}
+            for name, frames in (("draw_full", full), ("draw_incremental", incremental)):
+                frames.sort()
+                results.append({"name": name, **case, **time_stats(frames),
+                                "p99_seconds": frames[int(len(frames) * 0.99)]})
+    return results
+# -------------------------------------------------------------------------------------
+def result_key(result: dict) -> str:
+    return f"{result['name']}/{result['poles']}p/{result['disks']}d/seed{result['seed']}"
+# -------------------------------------------------------------------------------------
+def find_regressions(results: List[dict], baseline: List[dict]) -> List[str]:
+    """One line per result that is slower or bigger than its baseline beyond the thresholds"""
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        noise = NOISE_FACTOR * max(result.get("spread_seconds", 0.0), old.get("spread_seconds", 0.0))
+        for metric, threshold, min_delta in (("median_seconds", TIME_THRESHOLD, max(MIN_TIME_DELTA, noise)),
+                                             ("peak_bytes", MEMORY_THRESHOLD, MIN_MEMORY_DELTA)):
+            if metric not in result or metric not in old:
+                continue
+            delta = result[metric] - old[metric]
+            if delta > min_delta and result[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{result_key(result)}: {metric} {old[metric]:.6g} -> {result[metric]:.6g} "
+                                   f"(+{delta / max(old[metric], 1e-12):.0%})")
+    return regressions
+# -------------------------------------------------------------------------------------
+def run() -> dict:
+    return {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor(), "cpus": os.cpu_count()},
+        "results": solver_benchmarks() + draw_benchmarks(),
+    }
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else "-"
+    baseline_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    report = run()
+    text = json.dumps(report, indent=1)
+    if output_path == "-":
+        print(text)
+    else:
+        with open(output_path, "w") as f:
+            f.write(text + "\n")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = find_regressions(report["results"], json.load(f)["results"])
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        print(f"{len(regressions)} regressions against {baseline_path}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+# ---------------------------------END-------------------------------------------------
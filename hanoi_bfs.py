@@ -0,0 +1,214 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Breadth-first search engines for generalized variants (any pole count) where no closed
+# form exists. States are dense base-P indices (StateCodec.index): digit s - 1 holds the
+# pole of the disk of size s.
+# The NumPy engine expands a whole BFS layer at once: disk digits, top disk of every pole,
+# legal moves and successor indices are all array operations, and duplicates are dropped
+# through a visited bitmap with one bit per state.
+# two_bit_bfs enumerates the whole state space with only 2 bits of memory per state.
+# Run this file directly to check two_bit_bfs against the layer engine and benchmark the
+# layer engine against the per-state Python BFS.
+# -------------------------------------------------------------------------------------
+import sys
+import time
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from hanoi_state import StateCodec
+
+BATCH_SIZE = 1 << 18  # States expanded per NumPy pass, bounds the temporary arrays
+TWO_BIT_BLOCK = 1 << 16  # States per rescan block of the two-bit BFS
+
+# Two-bit BFS field values, and the byte lookup that advances all 4 fields of a byte by one layer
+CURRENT, NEXT, DONE, NOT_REACHED = 0, 1, 2, 3
+ADVANCE_LAYER = np.array([sum((DONE if field == CURRENT else CURRENT if field == NEXT else field) << shift
+                              for shift in (0, 2, 4, 6) for field in [(byte >> shift) & 3])
+                          for byte in range(256)], dtype=np.uint8)
+# -------------------------------------------------------------------------------------
+def pole_powers(disk_count: int, pole_count: int) -> np.ndarray:
+    """P^(s - 1) for every disk size s, i.e. the index weight of each disk digit"""
+    return pole_count ** np.arange(disk_count, dtype=np.int64)
+# -------------------------------------------------------------------------------------
+def expand(states: np.ndarray, disk_count: int, pole_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    All legal successors of an array of state indices.
+    Returns (successors, src, dst) arrays, one entry per legal move (not deduplicated).
+    """
+    powers = pole_powers(disk_count, pole_count)
+    digits = (states[:, None] // powers) % pole_count  # (m, n): pole of every disk
+
+    # Top disk of every pole as a 0-based disk number, disk_count for an empty pole
+    tops = np.empty((pole_count, len(states)), dtype=np.int64)
+    for pole in range(pole_count):
+        on_pole = digits == pole
+        tops[pole] = np.where(on_pole.any(axis=1), on_pole.argmax(axis=1), disk_count)
+
+    successors, sources, targets = [], [], []
+    for src in range(pole_count):
+        # Weight of the moving disk; the empty-pole sentinel is clipped but never legal
+        weight = powers[np.minimum(tops[src], disk_count - 1)]
+        for dst in range(pole_count):
+            if src == dst:
+                continue
+            legal = tops[src] < tops[dst]  # Smaller disk onto larger disk or an empty pole
+            successors.append(states[legal] + (dst - src) * weight[legal])
+            sources.append(np.full(np.count_nonzero(legal), src, dtype=np.int8))
+            targets.append(np.full(np.count_nonzero(legal), dst, dtype=np.int8))
+
+    return np.concatenate(successors), np.concatenate(sources), np.concatenate(targets)
+# -------------------------------------------------------------------------------------
+def iter_layers(start: int, disk_count: int, pole_count: int = 3, stop: int = -1) -> Iterator[np.ndarray]:
+    """
+    Yield the BFS layers from start as sorted arrays of state indices (layer 0 is [start]).
+    Stops after the layer that contains `stop`, or once the whole state space is covered.
+    """
+    visited = np.zeros((pole_count ** disk_count + 7) // 8, dtype=np.uint8)
+    layer = np.array([start], dtype=np.int64)
+    visited[start >> 3] |= np.uint8(1 << (start & 7))
+
+    while len(layer):
+        yield layer
+        if stop >= 0 and np.any(layer == stop):
+            return
+
+        new_parts = []
+        for begin in range(0, len(layer), BATCH_SIZE):
+            successors, _, _ = expand(layer[begin:begin + BATCH_SIZE], disk_count, pole_count)
+            successors = np.unique(successors)
+
+            # Drop states already seen, then mark the rest in the bitmap
+            seen = (visited[successors >> 3] >> (successors & 7).astype(np.uint8)) & 1
+            successors = successors[seen == 0]
+            np.bitwise_or.at(visited, successors >> 3, (1 << (successors & 7)).astype(np.uint8))
+            new_parts.append(successors)
+
+        layer = np.sort(np.concatenate(new_parts)) if new_parts else np.empty(0, dtype=np.int64)
+# -------------------------------------------------------------------------------------
+def bfs_distance(poles: Sequence[Sequence[int]], disk_count: int) -> int:
+    """Minimal number of moves to the rightmost pole (any pole count)"""
+    codec = StateCodec(disk_count, len(poles))
+    goal = codec.index(codec.goal())
+    for distance, layer in enumerate(iter_layers(codec.index(codec.encode(poles)), disk_count, len(poles), goal)):
+        if np.any(layer == goal):
+            return distance
+    return -1  # Should never happen for valid initial states
+# -------------------------------------------------------------------------------------
+def bfs_solution(poles: Sequence[Sequence[int]], disk_count: int) -> List[Tuple[int, int]]:
+    """
+    Shortest (src, dst) move list to the rightmost pole (any pole count).
+    Keeps the sorted layers instead of parent pointers and walks back from the goal,
+    picking at every step a neighbour that lies in the previous layer.
+    """
+    pole_count = len(poles)
+    codec = StateCodec(disk_count, pole_count)
+    goal = codec.index(codec.goal())
+    layers = list(iter_layers(codec.index(codec.encode(poles)), disk_count, pole_count, goal))
+    if not np.any(layers[-1] == goal):
+        return []
+
+    moves = []
+    state = np.array([goal], dtype=np.int64)
+    for previous in reversed(layers[:-1]):
+        neighbours, sources, targets = expand(state, disk_count, pole_count)
+        i = np.flatnonzero(np.isin(neighbours, previous))[0]
+        moves.append((int(targets[i]), int(sources[i])))  # Reverse of the move previous -> state
+        state = neighbours[i:i + 1]
+    return moves[::-1]
+# -------------------------------------------------------------------------------------
+def two_bit_bfs(start: int, disk_count: int, pole_count: int = 3) -> List[int]:
+    """
+    Full enumeration from a base-P state index, returning the number of states at every distance.
+    Stores only 2 bits per state (3^20 states take 872 MB): not reached, current layer, next
+    layer or done. Distance mod 3 alone would not do here, because states three layers back
+    would look like the current layer and be expanded again on every third layer.
+    A flag per block of TWO_BIT_BLOCK states marks where the current and next layers are,
+    so a layer only scans those blocks instead of the whole array (3 poles have 2^n layers).
+    """
+    state_count = pole_count ** disk_count
+    slots = np.full((state_count + 3) // 4, 0xFF, dtype=np.uint8)  # 4 states per byte
+    block_bytes = TWO_BIT_BLOCK // 4
+    block_count = -(-len(slots) // block_bytes)
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+    slots[start >> 2] ^= np.uint8((NOT_REACHED ^ CURRENT) << (2 * (start & 3)))
+    blocks = np.zeros(block_count, dtype=bool)
+    blocks[(start >> 2) // block_bytes] = True
+    sizes = [1]
+
+    while True:
+        next_blocks = np.zeros(block_count, dtype=bool)
+        next_size = 0
+        pending, pending_size = [], 0
+        current_blocks = np.flatnonzero(blocks)
+        for i, block in enumerate(current_blocks):
+            first = block * block_bytes
+            fields = (slots[first:first + block_bytes, None] >> shifts) & 3
+            states = first * 4 + np.flatnonzero(fields.ravel() == CURRENT)
+            pending.append(states)
+            pending_size += len(states)
+            if pending_size < BATCH_SIZE and i + 1 < len(current_blocks):
+                continue
+
+            # Expand the collected current states; mark the successors never reached as next
+            successors, _, _ = expand(np.concatenate(pending), disk_count, pole_count)
+            pending, pending_size = [], 0
+            successors = np.unique(successors)
+            bytes_, offsets = successors >> 2, (2 * (successors & 3)).astype(np.uint8)
+            new = ((slots[bytes_] >> offsets) & 3) == NOT_REACHED
+            bytes_, offsets = bytes_[new], offsets[new]
+            np.bitwise_xor.at(slots, bytes_, ((NOT_REACHED ^ NEXT) << offsets).astype(np.uint8))
+            next_blocks[bytes_ // block_bytes] = True
+            next_size += len(bytes_)
+
+        # Current -> done, next -> current, only in the blocks that hold either layer
+        for block in np.flatnonzero(blocks | next_blocks):
+            first = block * block_bytes
+            slots[first:first + block_bytes] = ADVANCE_LAYER[slots[first:first + block_bytes]]
+
+        if not next_size:
+            return sizes
+        sizes.append(next_size)
+        blocks = next_blocks
+# -------------------------------------------------------------------------------------
+def benchmark(disk_counts: Sequence[int] = (6, 8, 10, 12), pole_count: int = 3) -> None:
+    """Time the NumPy engine against the per-state Python BFS, worst case start (all on pole 0)"""
+    import hanoi_solver
+
+    for disk_count in disk_counts:
+        state = (tuple(range(disk_count, 0, -1)),) + tuple(() for _ in range(pole_count - 1))
+
+        start = time.perf_counter()
+        python_distance = hanoi_solver.bfs_optimal_move_count(state, disk_count)
+        python_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        numpy_distance = bfs_distance(state, disk_count)
+        numpy_time = time.perf_counter() - start
+
+        if numpy_distance != python_distance:
+            raise AssertionError(f"{disk_count} disks: NumPy {numpy_distance}, Python {python_distance}")
+        print(f"{pole_count} poles, {disk_count:2d} disks: distance {numpy_distance:5d} | "
+              f"Python {python_time:8.3f}s | NumPy {numpy_time:8.3f}s | {python_time / numpy_time:5.1f}x")
+# -------------------------------------------------------------------------------------
+def check_two_bit_bfs() -> None:
+    """Compare two_bit_bfs with the layer sizes of iter_layers, including boards of several blocks"""
+    cases = ((3, 7, 0), (4, 6, 0), (5, 5, 0), (4, 9, 4 ** 9 // 3), (5, 7, 999))  # (poles, disks, start)
+    for pole_count, disk_count, start in cases:
+        expected = [len(layer) for layer in iter_layers(start, disk_count, pole_count)]
+        sizes = two_bit_bfs(start, disk_count, pole_count)
+        if sizes != expected:
+            raise AssertionError(f"{pole_count} poles, {disk_count} disks from {start}: "
+                                 f"two_bit_bfs {sizes}, iter_layers {expected}")
+    print(f"two_bit_bfs matches iter_layers on {len(cases)} boards")
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    check_two_bit_bfs()
+    if len(sys.argv) > 1:
+        benchmark([int(arg) for arg in sys.argv[1].split(",")], int(sys.argv[2]) if len(sys.argv) > 2 else 3)
+    else:
+        benchmark()
+        benchmark((4, 6, 8), pole_count=4)
+# ---------------------------------END-------------------------------------------------
@@ -0,0 +1,526 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Headless game engine for the Tower of Hanoi variant: puzzle state, moves, modes,
+# auto-solve pacing and scoring, with no pygame import, so it can run in backend workers.
+# Poles are plain lists of disk sizes, bottom to top. hanoi_pygame.py renders on top of it.
+# The A* solver for 4+ poles (and NumPy with it) is only imported when it is needed.
+# -------------------------------------------------------------------------------------
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+import hanoi_solver
+from hanoi_replay import ReplayWriter
+from hanoi_state import StateCodec
+
+POLE_COUNT = 3  # 3, 4 or 5 poles
+
+# Auto-solve speed control
+MIN_AUTO_DELAY = 0.1   # Fastest speed (100ms between moves)
+MAX_AUTO_DELAY = 2.0   # Slowest speed (2 seconds between moves)
+AUTO_DELAY_STEP = 0.1  # Speed adjustment increment
+
+# Fixed-timestep simulation: auto moves and disk animations advance in SIM_STEP increments,
+# whatever the frame rate; the renderer interpolates between the last two steps
+SIM_STEP = 1 / 120
+MAX_FRAME_TIME = 3.0          # Longer stalls (window dragged, machine suspended) are not caught up on
+MOVE_ANIMATION_TIME = 0.3     # Seconds for a disk to lift, slide and drop (shortened at fast auto speeds)
+
+# Turbo auto-solve: moves run on their own clock, many per update, and only the latest state is drawn
+TURBO_MOVE_RATE = 100_000     # Default moves per second
+MIN_TURBO_RATE = 1_000
+MAX_TURBO_RATE = 10_000_000
+TURBO_FRAME_BUDGET = 0.012    # Seconds of move work per update, keeps the window responsive
+TURBO_BATCH = 4096            # Moves applied between two budget checks
+
+# Disk settings
+MAX_DISKS = 8
+MIN_DISKS = 3
+
+DISK_COUNT = 5
+# -------------------------------------------------------------------------------------
+class HanoiCore:
+    def __init__(self, disk_count: int = 5, pole_count: int = POLE_COUNT):
+        if pole_count != 3:
+            # Every new game runs the A* solver synchronously; keep 4+ poles within the boards
+            # it solves at once (those covered by a single distance table)
+            import hanoi_distance_table
+            if not hanoi_distance_table.table_fits(disk_count, pole_count):
+                raise ValueError(f"{pole_count} poles support at most "
+                                 f"{hanoi_distance_table.max_table_disks(pole_count)} disks")
+        self.disk_count = disk_count
+        self.pole_count = pole_count
+        self.poles: List[List[int]] = [[] for _ in range(pole_count)]
+        self.selected_pole = None
+        self.moves = 0
+        self.mode = "manual"  # "manual" or "auto"
+        self.auto_solving = False
+        self.auto_move_delay = 0.5  # seconds between auto moves
+        self.last_auto_move_time = 0  # Simulation time of the last auto move
+        self.sim_time = 0.0
+        self.sim_accumulator = 0.0  # Real time not yet simulated, less than one SIM_STEP after update()
+        self.last_update_time = time.time()
+        self.sim_idle = True  # Nothing to simulate after the last update: the time until the next one is not simulated
+        self.animation = None  # (size, from_pole, to_pole) of the disk in flight, already moved logically
+        self.animation_progress = 0.0  # 0 to 1 along the lift/slide/drop path, at sim_time
+        self.previous_animation_progress = 0.0  # ... and one step earlier, for interpolation
+        self.turbo = False
+        self.turbo_move_rate = TURBO_MOVE_RATE
+        self.turbo_clock_start = 0  # Simulation clock: turbo_moves are due turbo_move_rate per second from here
+        self.turbo_moves = 0
+        self.turbo_wall_start = 0   # Real time when the current turbo run started, for the moves/sec report
+        self.turbo_measured_rate = 0.0
+        self.move_sequence = iter(())  # Lazy stream of (source, target) moves for auto mode
+        self.auto_moves_left = 0
+        self.auto_start = None  # (state, moves so far) when the 3-pole auto-solve started, for seek_auto_solve
+        self.auto_total = 0  # Moves in that solution
+        self.custom_goal = None  # Goal state of prepare_auto_solve_to; the rightmost-pole distance and win check pause
+        self.optimal_moves = 0
+        self.remaining_moves = 0  # Optimal moves left from the current state, kept up to date by move_disk
+        self.remaining_change = 0  # -1, 0 or +1: what the last move did to remaining_moves
+        self.user_score = 0
+        self.solved = False
+        self.solver_time = 0.0  # Seconds spent in solver calls, read and reset by the frame profiler
+        self.recorder: Optional[ReplayWriter] = None  # Replay being recorded, see start_recording
+
+        # Win message display control
+        self.show_win_message_flag = False
+        self.win_message_start_time = 0
+        self.win_message_duration = 3.0  # seconds
+
+        self.generate_random_initial_state()
+    # ----------------------------------------
+    def adjust_speed(self, increase: bool):
+        """Adjust auto-solve speed using arrow keys"""
+        if self.turbo:
+            # Turbo rate doubles or halves; rebase the clock so the moves already played stay on schedule
+            factor = 2 if increase else 0.5
+            self.turbo_move_rate = int(min(MAX_TURBO_RATE, max(MIN_TURBO_RATE, self.turbo_move_rate * factor)))
+            self.turbo_clock_start = time.time() - self.turbo_moves / self.turbo_move_rate
+            print(f"Turbo speed: {self.turbo_move_rate} moves/s")
+            return
+
+        if increase:
+            self.auto_move_delay = max(MIN_AUTO_DELAY, self.auto_move_delay - AUTO_DELAY_STEP)
+        else:
+            self.auto_move_delay = min(MAX_AUTO_DELAY, self.auto_move_delay + AUTO_DELAY_STEP)
+
+        # Show speed change feedback
+        speed_multiplier = 1 / self.auto_move_delay
+        print(f"Auto-solve speed: {speed_multiplier:.1f}x speed ({self.auto_move_delay:.1f}s delay)")
+    # ----------------------------------------
+    def generate_random_initial_state(self, min_moves: Optional[int] = None, max_moves: Optional[int] = None):
+        """
+        New puzzle, uniform over every valid state except the solved one. With a move range,
+        uniform over the states whose optimal solution takes min_moves to max_moves moves,
+        drawn from the distance table's bucket index (see hanoi_distance_table.py); ValueError
+        when the board is too large for a table.
+        """
+        ranged = min_moves is not None or max_moves is not None
+        if ranged:
+            import hanoi_distance_table
+            if not hanoi_distance_table.table_fits(self.disk_count, self.pole_count):
+                raise ValueError(f"Move ranges on {self.pole_count} poles support at most "
+                                 f"{hanoi_distance_table.max_table_disks(self.pole_count)} disks")
+
+        self.stop_recording()  # A replay covers one puzzle
+        codec = StateCodec(self.disk_count, self.pole_count)
+        if not ranged:
+            code = codec.random_code(exclude_goal=True)
+        else:
+            table = self.run_solver(hanoi_distance_table.get_table, self.disk_count, self.pole_count)
+            longest = (1 << self.disk_count) - 1  # No state is farther than 2^n - 1 moves
+            code = table.sample(max(1, min_moves or 1), longest if max_moves is None else max_moves)
+        self.poles = [list(pole) for pole in codec.decode(code)]
+        if self.pole_count != 3:
+            # distance_to_goal and hint look up this table after every move: build it now, with the
+            # pattern databases, rather than stall the first move (HanoiCore boards always fit)
+            import hanoi_distance_table
+            self.run_solver(hanoi_distance_table.get_table, self.disk_count, self.pole_count)
+
+        self.moves = 0
+        self.selected_pole = None
+        self.auto_solving = False
+        self.move_sequence = iter(())
+        self.auto_moves_left = 0
+        self.auto_start = None
+        self.custom_goal = None
+        self.animation = None
+        self.optimal_moves = self.calculate_optimal_moves()
+        self.remaining_moves = self.optimal_moves
+        self.remaining_change = 0
+        self.user_score = 0
+        self.solved = False
+        self.show_win_message_flag = False
+        self.win_message_start_time = 0
+    # ----------------------------------------
+    def get_state(self) -> Tuple[Tuple[int, ...], ...]:
+        """Current state as a tuple of tuples of disk sizes (bottom to top) per pole"""
+        return tuple(tuple(pole) for pole in self.poles)
+    # ----------------------------------------
+    def calculate_optimal_moves(self) -> int:
+        """
+        Calculate the minimal moves needed to solve from current state.
+        Closed form, O(n), for 3 poles; A* with pattern databases for 4 or more poles.
+        Returns the number of moves in the optimal solution.
+        """
+        if self.pole_count != 3:
+            import hanoi_multipeg
+            return self.run_solver(hanoi_multipeg.astar_distance, self.get_state(), self.disk_count)
+        return self.run_solver(hanoi_solver.optimal_move_count, self.get_state(), self.disk_count)
+    # ----------------------------------------
+    def distance_to_goal(self) -> int:
+        """
+        Optimal moves left from the current state, cheap enough to run after every move:
+        the O(n) closed form for 3 poles, one distance table lookup for 4+ poles (the table is
+        built with the puzzle, see generate_random_initial_state). Only boards within
+        MAX_TABLE_STATES get a table; larger 4+ pole boards fall back to a full A* search on every call.
+        """
+        if self.pole_count != 3:
+            import hanoi_distance_table
+            if not hanoi_distance_table.table_fits(self.disk_count, self.pole_count):
+                return self.calculate_optimal_moves()
+            table = self.run_solver(hanoi_distance_table.get_table, self.disk_count, self.pole_count)
+            return table.distance(self.poles)
+        return self.run_solver(hanoi_solver.optimal_move_count, self.poles, self.disk_count)
+    # ----------------------------------------
+    def hint(self) -> Optional[Tuple[int, int]]:
+        """
+        An optimal next move (source, target) from the current state, None when solved.
+        No search: O(n) closed form for 3 poles; for 4+ poles, a legal move whose successor is
+        one step closer in the distance table. Boards too large for a table (see distance_to_goal)
+        fall back to the first move of a full A* search.
+        """
+        if self.pole_count == 3:
+            return self.run_solver(hanoi_solver.next_optimal_move, self.poles, self.disk_count)
+
+        import hanoi_distance_table
+        if not hanoi_distance_table.table_fits(self.disk_count, self.pole_count):
+            import hanoi_multipeg
+            solution = self.run_solver(hanoi_multipeg.astar_solution, self.get_state(), self.disk_count)
+            return solution[0] if solution else None
+        table = self.run_solver(hanoi_distance_table.get_table, self.disk_count, self.pole_count)
+        code = table.codec.encode(self.poles)
+        remaining = table.distance_code(code)
+        if remaining == 0:
+            return None
+        for src, dst, new_code in table.codec.successors(code):
+            if table.distance_code(new_code) == remaining - 1:
+                return src, dst
+        return None  # Unreachable for valid states
+    # ----------------------------------------
+    def run_solver(self, solver, *args):
+        """Call a solver function, adding its run time to solver_time"""
+        started = time.perf_counter()
+        try:
+            return solver(*args)
+        finally:
+            self.solver_time += time.perf_counter() - started
+    # ----------------------------------------
+    def calculate_optimal_moves_bfs(self) -> int:
+        """Same as calculate_optimal_moves but using BFS. Only used to verify the closed form."""
+        return hanoi_solver.bfs_optimal_move_count(self.get_state(), self.disk_count)
+    # ----------------------------------------
+    def start_recording(self, path: str):
+        """Record every move from the current state (manual or auto) as a binary replay, see hanoi_replay.py"""
+        self.stop_recording()
+        self.recorder = ReplayWriter(path, self.poles, self.disk_count)
+    # ----------------------------------------
+    def stop_recording(self):
+        """Finish the replay being recorded, if any"""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+    # ----------------------------------------
+    def click_pole(self, pole_idx: int):
+        """Select a pole, or move its top disk to the clicked pole if one is already selected"""
+        # Handle pole clicks only in manual mode
+        if self.mode != "manual" or self.auto_solving:
+            return
+
+        if self.selected_pole is None:
+            # Select the pole if it has disks
+            if self.poles[pole_idx]:
+                self.selected_pole = pole_idx
+        else:
+            # Try to move disk from selected pole to this pole
+            if self.selected_pole != pole_idx:
+                self.move_disk(self.selected_pole, pole_idx)
+
+            # Deselect in any case
+            self.selected_pole = None
+    # ----------------------------------------
+    def set_turbo(self, enabled: bool):
+        """Switch turbo auto-solve on or off (also while a solution is playing)"""
+        self.turbo = enabled
+        self.reset_turbo_clock()
+    # ----------------------------------------
+    def reset_turbo_clock(self):
+        self.turbo_clock_start = self.turbo_wall_start = time.time()
+        self.turbo_moves = 0
+        self.turbo_measured_rate = 0.0
+    # ----------------------------------------
+    def set_mode(self, mode: str):
+        self.mode = mode
+        self.auto_start = None  # Manual moves would leave the seek base behind; auto mode sets a new one
+        if self.custom_goal is not None:
+            # Back to the usual goal: the rightmost pole
+            self.custom_goal = None
+            self.auto_solving = False
+            self.update_remaining_moves()
+            self.check_win()
+        if mode == "auto":
+            self.prepare_auto_solve()
+    # ----------------------------------------
+    def prepare_auto_solve(self):
+        """
+        Start streaming the shortest sequence of moves from the current state to the goal.
+        Moves are generated one at a time as they are played, so even huge solutions start instantly.
+        """
+        state = self.get_state()
+        if self.pole_count != 3:
+            # No closed form for 4+ poles: search the whole solution up front
+            import hanoi_multipeg
+            solution = self.run_solver(hanoi_multipeg.astar_solution, state, self.disk_count)
+            self.move_sequence = iter(solution)
+            self.auto_moves_left = len(solution)
+            self.auto_start = None
+        else:
+            self.move_sequence = hanoi_solver.iter_optimal_moves(state, self.disk_count)
+            self.auto_moves_left = self.run_solver(hanoi_solver.optimal_move_count, state, self.disk_count)
+            self.auto_start = (state, self.moves)
+            self.auto_total = self.auto_moves_left
+        self.auto_solving = self.auto_moves_left > 0
+        self.last_auto_move_time = self.sim_time
+        self.reset_turbo_clock()
+    # ----------------------------------------
+    def seek_auto_solve(self, move_count: int):
+        """
+        Jump to the state after move_count moves of the current 3-pole auto-solve (0 to auto_total),
+        e.g. for a timeline slider. O(n): the state comes from the closed form, not from playing the
+        moves, and the move stream restarts from there. Stops any replay being recorded.
+        ValueError, with nothing changed, outside auto mode or for a move count out of range.
+        """
+        if self.mode != "auto" or self.auto_start is None:
+            raise ValueError("No 3-pole auto-solve to seek in")
+        if not 0 <= move_count <= self.auto_total:
+            raise ValueError(f"Move {move_count} is outside the auto-solve (0 to {self.auto_total})")
+        state, moves_before = self.auto_start
+        self.stop_recording()
+        self.poles = [list(pole) for pole in
+                      self.run_solver(hanoi_solver.state_after_optimal_moves, state, self.disk_count, move_count)]
+        self.moves = moves_before + move_count
+        self.selected_pole = None
+        self.animation = None
+        self.move_sequence = hanoi_solver.iter_optimal_moves(self.poles, self.disk_count)
+        self.auto_moves_left = self.auto_total - move_count
+        self.auto_solving = self.auto_moves_left > 0
+        self.last_auto_move_time = self.sim_time
+        self.reset_turbo_clock()
+        self.update_remaining_moves()
+
+        # Seeking back before the goal undoes the win, so reaching it again scores and shows it again
+        if len(self.poles[-1]) != self.disk_count:
+            self.solved = False
+            self.user_score = 0
+            self.show_win_message_flag = False
+        self.check_win()
+    # ----------------------------------------
+    def prepare_auto_solve_to(self, goal: Tuple[Tuple[int, ...], ...]):
+        """
+        Like prepare_auto_solve, but towards any valid goal state (disk sizes bottom to top per pole);
+        ValueError for anything else. Uses a bidirectional BFS, so it works for any pole count but
+        only for small disk counts. Until the next set_mode or new game, remaining_moves and the win
+        check (both measured against the rightmost pole) are not updated; auto_moves_left is the
+        distance to the custom goal.
+        """
+        solution = self.run_solver(hanoi_solver.bidirectional_solution, self.get_state(), goal, self.disk_count)
+        self.custom_goal = tuple(tuple(pole) for pole in goal)
+        self.mode = "auto"
+        self.move_sequence = iter(solution)
+        self.auto_moves_left = len(solution)
+        self.auto_start = None  # Not a closed-form solution
+        self.auto_solving = self.auto_moves_left > 0
+        self.last_auto_move_time = self.sim_time
+        self.reset_turbo_clock()
+    # ----------------------------------------
+    def update(self):
+        current_time = time.time()
+        frame_time = 0.0 if self.sim_idle else min(current_time - self.last_update_time, MAX_FRAME_TIME)
+        self.last_update_time = current_time
+
+        # Handle win message timing
+        if self.show_win_message_flag:
+            if current_time - self.win_message_start_time >= self.win_message_duration:
+                self.show_win_message_flag = False
+
+        # Turbo runs on its own clock; everything else on fixed simulation steps
+        if self.turbo and self.mode == "auto" and self.auto_solving and self.auto_moves_left > 0:
+            self.play_turbo(current_time)
+            self.animation = None
+            return
+
+        self.sim_accumulator += frame_time
+        while self.sim_accumulator >= SIM_STEP:
+            self.sim_accumulator -= SIM_STEP
+            self.step()
+        self.sim_idle = self.animation is None and not (self.mode == "auto" and self.auto_solving)
+    # ----------------------------------------
+    def step(self):
+        """Advance the simulation by one SIM_STEP"""
+        self.sim_time += SIM_STEP
+
+        # Advance the disk in flight; it stays one step at the end so the last frame lands exactly
+        if self.animation is not None:
+            if self.animation_progress >= 1.0:
+                self.animation = None
+            else:
+                self.previous_animation_progress = self.animation_progress
+                self.animation_progress = min(1.0, self.animation_progress + SIM_STEP / self.animation_time())
+
+        # Handle auto-solving
+        if self.mode == "auto" and self.auto_solving and self.auto_moves_left > 0:
+            if self.sim_time - self.last_auto_move_time >= self.auto_move_delay:
+                source, target = next(self.move_sequence)
+                self.move_disk(source, target)
+                self.auto_moves_left -= 1
+                self.last_auto_move_time = self.sim_time
+
+                # Check if we're done
+                if self.auto_moves_left == 0:
+                    self.auto_solving = False
+    # ----------------------------------------
+    def animation_time(self) -> float:
+        """Duration of one disk move animation, short enough to finish before the next auto move"""
+        if self.mode == "auto":
+            return max(SIM_STEP, min(MOVE_ANIMATION_TIME, 0.8 * self.auto_move_delay))
+        return MOVE_ANIMATION_TIME
+    # ----------------------------------------
+    def interpolated_animation_progress(self) -> float:
+        """Progress of the disk in flight at the current real time, between the last two steps"""
+        alpha = self.sim_accumulator / SIM_STEP
+        return self.previous_animation_progress + (self.animation_progress - self.previous_animation_progress) * alpha
+    # ----------------------------------------
+    def play_turbo(self, current_time: float):
+        """
+        Apply every move the turbo clock has made due since the last update, but no more than
+        TURBO_FRAME_BUDGET seconds of work; the renderer then draws only the resulting state.
+        When the machine cannot keep up, the simulation clock slows down instead of piling up moves.
+        """
+        due = int((current_time - self.turbo_clock_start) * self.turbo_move_rate) - self.turbo_moves
+        due = min(due, self.auto_moves_left)
+        deadline = time.perf_counter() + TURBO_FRAME_BUDGET
+        played = 0
+        move_disk = self.move_disk
+        while played < due and time.perf_counter() < deadline:
+            batch = min(TURBO_BATCH, due - played)
+            for source, target in itertools.islice(self.move_sequence, batch):
+                move_disk(source, target)
+            played += batch
+
+        if played < due:
+            self.turbo_clock_start += (due - played) / self.turbo_move_rate
+        self.turbo_moves += played
+        self.auto_moves_left -= played
+        if played:
+            self.update_remaining_moves()
+        elapsed = time.time() - self.turbo_wall_start
+        if elapsed > 0:
+            self.turbo_measured_rate = self.turbo_moves / elapsed
+
+        if self.auto_moves_left == 0:
+            self.auto_solving = False
+            print(f"Turbo: {self.turbo_moves} moves in {elapsed:.2f}s ({self.turbo_measured_rate:.0f} moves/s)")
+    # ----------------------------------------
+    def seconds_until_update(self) -> Optional[float]:
+        """Time until update() has something to do (next auto move or win message timeout), None when idle"""
+        deadlines = []
+        if self.show_win_message_flag:
+            deadlines.append(self.win_message_start_time + self.win_message_duration)
+        if self.mode == "auto" and self.auto_solving and self.auto_moves_left > 0:
+            if self.turbo:
+                return 0.0
+            sim_wait = self.last_auto_move_time + self.auto_move_delay - self.sim_time - self.sim_accumulator
+            deadlines.append(time.time() + sim_wait)
+        if self.animation is not None:
+            return 0.0
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.time())
+    # ----------------------------------------
+    def move_disk(self, from_pole_idx: int, to_pole_idx: int):
+        from_pole = self.poles[from_pole_idx]
+        to_pole = self.poles[to_pole_idx]
+
+        if not from_pole:
+            return False
+
+        # Check if move is valid
+        if to_pole and to_pole[-1] < from_pole[-1]:
+            return False
+
+        # Perform the move
+        to_pole.append(from_pole.pop())
+        self.moves += 1
+        if self.recorder is not None:
+            self.recorder.append(from_pole_idx, to_pole_idx)
+
+        # The move is done logically; the renderer shows the disk in flight until the animation ends.
+        # Turbo skips both, and play_turbo updates the remaining distance once per batch.
+        if not (self.turbo and self.auto_solving):
+            self.animation = (to_pole[-1], from_pole_idx, to_pole_idx)
+            self.animation_progress = self.previous_animation_progress = 0.0
+            self.update_remaining_moves()
+
+        self.check_win()
+        return True
+    # ----------------------------------------
+    def check_win(self):
+        # Check for win condition (all disks on rightmost pole)
+        if self.custom_goal is not None:
+            return
+        if len(self.poles[-1]) == self.disk_count and not self.solved:
+            self.solved = True
+            self.calculate_user_score()
+            # Start showing win message (non-blocking)
+            self.show_win_message_flag = True
+            self.win_message_start_time = time.time()
+    # ----------------------------------------
+    def update_remaining_moves(self):
+        """Refresh the distance to the goal; adjacent states differ by at most one move"""
+        if self.custom_goal is not None:
+            return
+        remaining = self.distance_to_goal()
+        self.remaining_change = remaining - self.remaining_moves
+        self.remaining_moves = remaining
+    # ----------------------------------------
+    def calculate_user_score(self):
+        """Calculate user's score based on moves taken vs optimal moves"""
+        if self.optimal_moves > 0:
+            # Score is percentage where optimal moves = 100%
+            # Minimum score is 100% (if user matches optimal)
+            # Higher moves give lower percentage
+            self.user_score = min(100, int((self.optimal_moves / max(1, self.moves)) * 100))
+        else:
+            self.user_score = 100  # If optimal is 0 (already solved)
+    # ----------------------------------------
+    def rating(self) -> str:
+        """Performance rating shown with the win message"""
+        if self.moves == self.optimal_moves:
+            return "Perfect! You matched the optimal solution!"
+        elif self.moves <= self.optimal_moves * 1.2:
+            return "Excellent! Very close to optimal!"
+        elif self.moves <= self.optimal_moves * 1.5:
+            return "Good! You can still improve."
+        else:
+            return "Keep practicing! Try to find more efficient solutions."
+    # ----------------------------------------
+    def is_valid_state(self) -> bool:
+        # Check if disks are in correct order (smallest on top)
+        for pole in self.poles:
+            for i in range(1, len(pole)):
+                if pole[i] > pole[i - 1]:
+                    return False
+        return True
+# ---------------------------------END-------------------------------------------------
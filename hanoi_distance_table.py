@@ -0,0 +1,138 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# On-disk distance database: distance to "all disks on the rightmost pole" for every state.
+# The table is a flat array indexed by the base-P state index (StateCodec.index), one
+# unsigned integer per state: 1 byte while distances fit (up to 8 disks on 3 poles),
+# 2 or 4 bytes beyond that. It is built once per disk/pole count with a single reverse BFS
+# from the goal (NumPy frontier engine), saved under distance_tables/ and memory-mapped read-only afterwards, so
+# every process shares the same pages and a lookup is one array access.
+# Usage: python hanoi_distance_table.py <disk_count> [pole_count]
+# -------------------------------------------------------------------------------------
+import mmap
+import os
+import random
+import sys
+import time
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from hanoi_bfs import iter_layers
+from hanoi_state import StateCodec
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "distance_tables")
+MAX_TABLE_STATES = 4 ** 12  # Largest table worth building on demand: the 12-disk 4-pole pattern database
+# -------------------------------------------------------------------------------------
+def table_typecode(disk_count: int) -> str:
+    """Smallest array typecode that holds 2^n - 1, the longest optimal solution on 3 or more poles"""
+    longest = (1 << disk_count) - 1
+    if longest <= 0xFF:
+        return 'B'
+    if longest <= 0xFFFF:
+        return 'H'
+    return 'I'
+# -------------------------------------------------------------------------------------
+def table_fits(disk_count: int, pole_count: int = 3) -> bool:
+    """Whether the P^n table is small enough to build on demand (about a minute and 32 MB at the limit)"""
+    return pole_count ** disk_count <= MAX_TABLE_STATES
+# -------------------------------------------------------------------------------------
+def max_table_disks(pole_count: int) -> int:
+    """Most disks whose table fits in MAX_TABLE_STATES (12 on 4 poles, 10 on 5)"""
+    disk_count = 0
+    while table_fits(disk_count + 1, pole_count):
+        disk_count += 1
+    return disk_count
+# -------------------------------------------------------------------------------------
+def table_path(disk_count: int, pole_count: int = 3, table_dir: str = TABLE_DIR) -> str:
+    return os.path.join(table_dir, f"hanoi_{pole_count}p_{disk_count}d_{table_typecode(disk_count)}.dist")
+# -------------------------------------------------------------------------------------
+def build_distances(disk_count: int, pole_count: int = 3) -> np.ndarray:
+    """Reverse BFS from the goal over all P^n states; returns distances indexed by state index"""
+    codec = StateCodec(disk_count, pole_count)
+    distances = np.zeros(pole_count ** disk_count, dtype=np.dtype(table_typecode(disk_count)))
+
+    # Every move is reversible, so distance from the goal equals distance to the goal.
+    # The layers come from the NumPy frontier engine (see hanoi_bfs.py).
+    for distance, layer in enumerate(iter_layers(codec.index(codec.goal()), disk_count, pole_count)):
+        distances[layer] = distance
+    return distances
+# -------------------------------------------------------------------------------------
+class DistanceTable:
+    def __init__(self, disk_count: int, pole_count: int = 3, table_dir: str = TABLE_DIR):
+        self.disk_count = disk_count
+        self.pole_count = pole_count
+        self.codec = StateCodec(disk_count, pole_count)
+        self.path = table_path(disk_count, pole_count, table_dir)
+
+        if not os.path.exists(self.path):
+            self.build(table_dir)
+
+        with open(self.path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.distances = memoryview(self.mmap).cast(table_typecode(disk_count))
+        self.buckets = None  # (state indices sorted by distance, start of each distance), see bucket_index
+    # ----------------------------------------
+    def build(self, table_dir: str):
+        """Build the table and write it atomically, so concurrent processes never see a partial file"""
+        os.makedirs(table_dir, exist_ok=True)
+        start = time.time()
+        distances = build_distances(self.disk_count, self.pole_count)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            distances.tofile(f)
+        os.replace(tmp_path, self.path)
+        print(f"Built {self.path} ({len(distances)} states) in {time.time() - start:.2f}s")
+    # ----------------------------------------
+    def distance(self, poles: Sequence[Sequence[int]]) -> int:
+        """Optimal move count from a tuple-of-tuples state to the rightmost pole"""
+        return self.distances[self.codec.index(self.codec.encode(poles))]
+    # ----------------------------------------
+    def distance_code(self, code: int) -> int:
+        """Optimal move count from a packed state (see hanoi_state.py)"""
+        return self.distances[self.codec.index(code)]
+    # ----------------------------------------
+    def bucket_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distance-bucket index, built on first use: all state indices sorted by distance, and
+        starts[d], the position of the first state at distance d in that order
+        (states at distance d are order[starts[d]:starts[d + 1]]).
+        """
+        if self.buckets is None:
+            distances = np.asarray(self.distances)
+            order = np.argsort(distances, kind='stable')
+            starts = np.searchsorted(distances[order], np.arange(int(distances.max()) + 2))
+            self.buckets = (order, starts)
+        return self.buckets
+    # ----------------------------------------
+    def sample(self, min_distance: int, max_distance: int, rng=random) -> int:
+        """Uniform packed state among all states whose distance lies in [min_distance, max_distance]"""
+        order, starts = self.bucket_index()
+        longest = len(starts) - 2
+        begin = starts[min(max(min_distance, 0), longest + 1)]
+        end = starts[min(max(max_distance + 1, 0), longest + 1)]
+        if begin >= end:
+            raise ValueError(f"No {self.disk_count}-disk state is {min_distance} to {max_distance} moves "
+                             f"from the goal (longest is {longest})")
+        return self.codec.from_index(int(order[rng.randrange(begin, end)]))
+    # ----------------------------------------
+    def close(self):
+        self.buckets = None
+        self.distances.release()
+        self.mmap.close()
+# -------------------------------------------------------------------------------------
+_tables: Dict[Tuple[int, int], DistanceTable] = {}
+
+def get_table(disk_count: int, pole_count: int = 3) -> DistanceTable:
+    """Per-process cache of opened tables"""
+    key = (disk_count, pole_count)
+    if key not in _tables:
+        _tables[key] = DistanceTable(disk_count, pole_count)
+    return _tables[key]
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    poles = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    table = get_table(disks, poles)
+    print(f"{table.path}: {len(table.distances)} states, max distance {max(table.distances)}")
+# ---------------------------------END-------------------------------------------------
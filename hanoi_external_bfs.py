@@ -0,0 +1,226 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# External-memory BFS for instances whose frontiers do not fit in RAM (e.g. 4 poles, 15+ disks).
+# Every BFS layer is a sorted binary file of int64 state indices (StateCodec.index).
+# There is no in-memory visited set: in an undirected graph every neighbour of layer d lies
+# in layer d - 1, d or d + 1, so the new layer is deduplicated by removing the states found
+# in the two previous layer files, and only those two files (plus the new one) are kept.
+# Successors are streamed into value-range bucket files whose boundaries are quantiles of a
+# sample of the successors; a bucket that still exceeds the memory budget is split again the
+# same way, so every bucket is sorted and deduplicated within a fixed budget. Buckets are
+# written back in range order, which keeps the new layer file sorted, and the known layers
+# are subtracted by streaming them in fixed-size chunks.
+# Usage: python hanoi_external_bfs.py <disk_count> [pole_count] [work_dir]
+# -------------------------------------------------------------------------------------
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Iterator, List
+
+import numpy as np
+
+from hanoi_bfs import expand
+from hanoi_state import StateCodec
+
+MEMORY_STATES = 1 << 22  # States held in RAM at once (32 MB of int64), per bucket or chunk
+# -------------------------------------------------------------------------------------
+def read_layer(path: str) -> np.ndarray:
+    """Memory-map a layer file (empty array for an empty file)"""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.memmap(path, dtype=np.int64, mode='r')
+# -------------------------------------------------------------------------------------
+def remove_known(states: np.ndarray, layer: np.ndarray, memory_states: int = MEMORY_STATES) -> np.ndarray:
+    """
+    Drop the sorted states that appear in a sorted (memory-mapped) layer, reading only the
+    overlapping range, memory_states entries at a time
+    """
+    if not len(states) or not len(layer):
+        return states
+    begin = np.searchsorted(layer, states[0])
+    end = np.searchsorted(layer, states[-1], side='right')
+    for chunk_begin in range(begin, end, memory_states):
+        chunk = np.asarray(layer[chunk_begin:min(end, chunk_begin + memory_states)])
+        positions = np.minimum(np.searchsorted(chunk, states), len(chunk) - 1)
+        states = states[chunk[positions] != states]
+        if not len(states):
+            break
+    return states
+# -------------------------------------------------------------------------------------
+def quantile_bounds(sample: np.ndarray, bucket_count: int) -> np.ndarray:
+    """Upper bounds (exclusive) of all but the last bucket, splitting the sample into equal parts"""
+    if not len(sample) or bucket_count < 2:
+        return np.empty(0, dtype=np.int64)
+    sample = np.sort(sample)
+    cuts = sample[(np.arange(1, bucket_count) * len(sample)) // bucket_count]
+    return np.unique(cuts)
+# -------------------------------------------------------------------------------------
+def write_buckets(values: np.ndarray, bounds: np.ndarray, files: list):
+    """Append every value to the file of its bucket (bucket b holds bounds[b - 1] <= value < bounds[b])"""
+    buckets = np.searchsorted(bounds, values, side='right')
+    order = np.argsort(buckets, kind='stable')
+    values, buckets = values[order], buckets[order]
+    limits = np.searchsorted(buckets, np.arange(len(files) + 1))
+    for b, f in enumerate(files):
+        if limits[b] < limits[b + 1]:
+            values[limits[b]:limits[b + 1]].tofile(f)
+# -------------------------------------------------------------------------------------
+def unique_bucket(path: str, memory_states: int) -> Iterator[np.ndarray]:
+    """
+    Yield the sorted distinct states of a bucket file, in increasing runs, and delete the file.
+    A bucket over the budget is split into sub-buckets at quantiles of a strided sample, or at
+    the middle of its value range when the sample cannot separate it, and each is handled in turn.
+    Every split separates the smallest value from the largest, so splitting ends; a value occurs
+    at most P(P - 1) times (once per move into it), so a single-value bucket is small.
+    """
+    count = os.path.getsize(path) // 8
+    if count <= memory_states:
+        states = np.sort(np.fromfile(path, dtype=np.int64))
+        if len(states):
+            states = states[np.concatenate(([True], states[1:] != states[:-1]))]  # Sorted unique, in place of np.unique
+        os.remove(path)
+        yield states
+        return
+
+    data = np.memmap(path, dtype=np.int64, mode='r')
+    low = min(int(data[begin:begin + memory_states].min()) for begin in range(0, count, memory_states))
+    high = max(int(data[begin:begin + memory_states].max()) for begin in range(0, count, memory_states))
+    if low == high:
+        del data
+        os.remove(path)
+        yield np.array([low], dtype=np.int64)
+        return
+
+    # Every cut lies in (low, high], so each part is strictly smaller than the bucket
+    part_count = -(-count // memory_states) * 2
+    bounds = quantile_bounds(np.asarray(data[::-(-count // memory_states)]), part_count)
+    bounds = bounds[(bounds > low) & (bounds <= high)]
+    if not len(bounds):
+        bounds = np.array([low + (high - low + 1) // 2], dtype=np.int64)
+
+    part_paths = [f"{path}.{part}" for part in range(len(bounds) + 1)]
+    part_files = [open(part_path, 'wb') for part_path in part_paths]
+    try:
+        for begin in range(0, count, memory_states):
+            write_buckets(np.asarray(data[begin:begin + memory_states]), bounds, part_files)
+    finally:
+        for f in part_files:
+            f.close()
+    del data
+    os.remove(path)
+    for part_path in part_paths:
+        yield from unique_bucket(part_path, memory_states)
+# -------------------------------------------------------------------------------------
+def external_bfs(start: int, disk_count: int, pole_count: int = 4, work_dir: str = None,
+                 stop: int = -1, memory_states: int = MEMORY_STATES,
+                 report: Callable[[str], None] = print) -> List[int]:
+    """
+    BFS from a base-P state index with disk-backed layers; returns the size of every layer.
+    Stops after the layer containing `stop`, or when the whole component has been visited.
+    """
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="hanoi_bfs_")
+    os.makedirs(work_dir, exist_ok=True)
+    layer_path = lambda depth: os.path.join(work_dir, f"layer_{depth:06d}.bin")
+    moves_per_state = pole_count * (pole_count - 1) // 2  # Upper bound on legal moves
+
+    np.array([start], dtype=np.int64).tofile(layer_path(0))
+    open(layer_path(-1), 'wb').close()  # Empty "layer -1" keeps the merge uniform
+    sizes = [1]
+    depth = 0
+    try:
+        while sizes[-1]:
+            layer = read_layer(layer_path(depth))
+            found = np.searchsorted(layer, stop)
+            if stop >= 0 and found < len(layer) and layer[found] == stop:
+                break
+            started = time.time()
+
+            # 1) Expand the layer chunk by chunk into value-range buckets, bounded by quantiles
+            #    of the successors of an evenly spaced sample of the layer
+            bucket_count = max(1, -(-sizes[-1] * moves_per_state // memory_states))
+            chunk_size = max(1, memory_states // moves_per_state)
+            sample = np.asarray(layer[::-(-len(layer) // chunk_size)])
+            bounds = quantile_bounds(expand(sample, disk_count, pole_count)[0], bucket_count)
+            bucket_paths = [os.path.join(work_dir, f"bucket_{b:04d}.bin") for b in range(len(bounds) + 1)]
+            bucket_files = [open(path, 'wb') for path in bucket_paths]
+            generated = 0
+            try:
+                for begin in range(0, len(layer), chunk_size):
+                    chunk = np.asarray(layer[begin:begin + chunk_size])
+                    successors, _, _ = expand(chunk, disk_count, pole_count)
+                    generated += len(successors)
+                    write_buckets(successors, bounds, bucket_files)
+            finally:
+                for f in bucket_files:
+                    f.close()
+
+            # 2) Sort and deduplicate each bucket (splitting it further if it is over the budget),
+            #    drop states of the previous two layers
+            previous = read_layer(layer_path(depth - 1))
+            size = 0
+            with open(layer_path(depth + 1), 'wb') as out:
+                for path in bucket_paths:
+                    for states in unique_bucket(path, memory_states):
+                        states = remove_known(remove_known(states, layer, memory_states), previous, memory_states)
+                        states.tofile(out)
+                        size += len(states)
+            del layer, previous
+
+            # Layer d - 1 is no longer needed once layer d + 1 exists
+            os.remove(layer_path(depth - 1))
+            depth += 1
+            sizes.append(size)
+            elapsed = time.time() - started
+            report(f"layer {depth:4d}: {size:12d} states | {generated:12d} generated | "
+                   f"{len(bucket_paths):4d} buckets | {elapsed:7.2f}s | {generated / max(elapsed, 1e-9):12.0f} states/s")
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if not sizes[-1]:
+        sizes.pop()  # The empty layer after the last one
+    return sizes
+# -------------------------------------------------------------------------------------
+def external_bfs_distance(poles, disk_count: int, work_dir: str = None,
+                          memory_states: int = MEMORY_STATES) -> int:
+    """Minimal number of moves to the rightmost pole, using disk-backed BFS layers"""
+    codec = StateCodec(disk_count, len(poles))
+    goal = codec.index(codec.goal())
+    sizes = external_bfs(codec.index(codec.encode(poles)), disk_count, len(poles), work_dir,
+                         goal, memory_states, report=lambda line: None)
+    return len(sizes) - 1
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    poles = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    directory = sys.argv[3] if len(sys.argv) > 3 else None
+
+    # Check against the in-memory BFS on small boards, with budgets small enough to force
+    # many buckets, re-split buckets and chunked subtraction of the known layers
+    from hanoi_bfs import iter_layers
+    started = time.time()
+    for check_poles, check_disks in ((3, 7), (4, 6), (5, 5)):
+        expected = [len(layer) for layer in iter_layers(0, check_disks, check_poles)]
+        for budget in (16, 256):
+            sizes = external_bfs(0, check_disks, check_poles, memory_states=budget, report=lambda line: None)
+            assert sizes == expected, (check_poles, check_disks, budget, sizes, expected)
+
+        # Early stop at the goal, from the middle of the state space
+        codec = StateCodec(check_disks, check_poles)
+        start = check_poles ** check_disks // 3
+        goal = codec.index(codec.goal())
+        expected = len(list(iter_layers(start, check_disks, check_poles, goal))) - 1
+        assert external_bfs_distance(codec.decode(codec.from_index(start)), check_disks, memory_states=16) == expected
+    print(f"Matches the in-memory BFS with small memory budgets ({time.time() - started:.1f}s)")
+
+    # Full enumeration from the classic start (all disks on the leftmost pole)
+    started = time.time()
+    layer_sizes = external_bfs(0, disks, poles, directory)
+    total = sum(layer_sizes)
+    print(f"{poles} poles, {disks} disks: {total} states in {len(layer_sizes)} layers "
+          f"(eccentricity {len(layer_sizes) - 1}) in {time.time() - started:.1f}s")
+# ---------------------------------END-------------------------------------------------
@@ -0,0 +1,154 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Optimal solver for 4 and more poles, where no closed form is known for arbitrary states
+# and plain BFS over P^n states is out of reach beyond ~12 disks.
+# A* search over packed states (see hanoi_state.py) guided by additive pattern databases:
+# the disks are split into disjoint groups of consecutive sizes, and the exact distance of
+# each group on its own (all other disks removed) comes from a precomputed distance table
+# (see hanoi_distance_table.py). Every move moves one disk of exactly one group, so the sum
+# over groups never overestimates and A* returns an optimal solution. Two partitions
+# (groups counted from the largest and from the smallest disk) are tried and the larger
+# estimate is used.
+# Scope: random 4-pole states are solved in well under a second up to about 13 disks, but
+# 14 disks can take half a minute and 20 disks are out of reach in pure Python. HanoiCore
+# therefore only plays 4+ pole games that a single distance table covers (12 disks on 4
+# poles, 10 on 5), where the heuristic is exact and every new game solves at once.
+# Run this file directly to time a few random 4-pole puzzles.
+# -------------------------------------------------------------------------------------
+import heapq
+import random
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from hanoi_distance_table import get_table
+from hanoi_state import StateCodec
+
+PDB_MAX_ENTRIES = 1 << 24  # Largest pattern database, in packed-code slots (12 disks on 4 poles)
+PDB_BATCH_SIZE = 1 << 16   # Codes mapped per NumPy pass while building a pattern database
+# -------------------------------------------------------------------------------------
+def pdb_group_size(pole_count: int) -> int:
+    """Largest disk group whose packed pattern database fits in PDB_MAX_ENTRIES slots"""
+    bits = StateCodec(1, pole_count).bits
+    return max(1, (PDB_MAX_ENTRIES.bit_length() - 1) // bits)
+# -------------------------------------------------------------------------------------
+class PatternDatabase:
+    """
+    Exact distance to the rightmost pole for every state of `group_size` disks, indexed
+    directly by the packed code of those disks, so a lookup is a shift, a mask and an index.
+    """
+    def __init__(self, group_size: int, pole_count: int):
+        self.group_size = group_size
+        self.pole_count = pole_count
+        codec = StateCodec(group_size, pole_count)
+        table = get_table(group_size, pole_count)
+
+        if 1 << codec.bits == pole_count:
+            # Packed codes are already the base-P index (4 or 8 poles): use the mapped table as is
+            self.distances = table.distances
+            return
+
+        # Map every packed code to its base-P index; codes with an unused field value stay 0
+        table_distances = np.frombuffer(table.distances, dtype=table.distances.format)
+        distances = np.zeros(1 << (codec.bits * group_size), dtype=table_distances.dtype)
+        powers = pole_count ** np.arange(group_size, dtype=np.int64)
+        for begin in range(0, len(distances), PDB_BATCH_SIZE):
+            codes = np.arange(begin, min(begin + PDB_BATCH_SIZE, len(distances)), dtype=np.int64)
+            fields = (codes[:, None] >> (codec.bits * np.arange(group_size))) & codec.field_mask
+            valid = (fields < pole_count).all(axis=1)
+            distances[codes[valid]] = table_distances[(fields[valid] * powers).sum(axis=1)]
+        self.distances = memoryview(distances)
+# -------------------------------------------------------------------------------------
+_databases: Dict[Tuple[int, int], PatternDatabase] = {}
+
+def get_pattern_database(group_size: int, pole_count: int) -> PatternDatabase:
+    key = (group_size, pole_count)
+    if key not in _databases:
+        _databases[key] = PatternDatabase(group_size, pole_count)
+    return _databases[key]
+# -------------------------------------------------------------------------------------
+class AdditiveHeuristic:
+    """Max over two disjoint-group partitions of the summed pattern database distances"""
+    def __init__(self, disk_count: int, pole_count: int, group_size: int = 0):
+        self.codec = StateCodec(disk_count, pole_count)
+        group_size = group_size or pdb_group_size(pole_count)
+
+        # Each partition is a list of (shift, mask, distances) per group of consecutive disks
+        self.partitions = []
+        for from_largest in (True, False):
+            groups = []
+            for first in range(0, disk_count, group_size):
+                size = min(group_size, disk_count - first)
+                lowest = disk_count - first - size if from_largest else first  # Smallest disk (0-based)
+                pdb = get_pattern_database(size, pole_count)
+                groups.append((lowest * self.codec.bits, (1 << (size * self.codec.bits)) - 1, pdb.distances))
+            self.partitions.append(groups)
+            if disk_count <= group_size:
+                break  # A single group is exact; the second partition would be identical
+    # ----------------------------------------
+    def __call__(self, code: int) -> int:
+        best = 0
+        for groups in self.partitions:
+            estimate = 0
+            for shift, mask, distances in groups:
+                estimate += distances[(code >> shift) & mask]
+            if estimate > best:
+                best = estimate
+        return best
+# -------------------------------------------------------------------------------------
+def astar_solution(poles: Sequence[Sequence[int]], disk_count: int, group_size: int = 0) -> List[Tuple[int, int]]:
+    """Optimal (src, dst) move list to the rightmost pole for any pole count"""
+    pole_count = len(poles)
+    heuristic = AdditiveHeuristic(disk_count, pole_count, group_size)
+    codec = heuristic.codec
+    start = codec.encode(poles)
+    goal = codec.goal()
+
+    parents = {start: None}  # state -> (prev_state, move)
+    best_g = {start: 0}
+    # Ties on f are broken towards deeper states, which reach the goal sooner
+    queue = [(heuristic(start), 0, start)]
+    while queue:
+        _, neg_g, state = heapq.heappop(queue)
+        g = -neg_g
+        if state == goal:
+            moves = []
+            while parents[state] is not None:
+                state, move = parents[state]
+                moves.append(move)
+            return moves[::-1]
+        if g > best_g[state]:
+            continue  # Stale queue entry
+
+        for src, dst, new_state in codec.successors(state):
+            new_g = g + 1
+            if new_g < best_g.get(new_state, new_g + 1):
+                best_g[new_state] = new_g
+                parents[new_state] = (state, (src, dst))
+                heapq.heappush(queue, (new_g + heuristic(new_state), -new_g, new_state))
+
+    return []  # Should never happen for valid initial states
+# -------------------------------------------------------------------------------------
+def astar_distance(poles: Sequence[Sequence[int]], disk_count: int, group_size: int = 0) -> int:
+    """Minimal number of moves to the rightmost pole for any pole count"""
+    return len(astar_solution(poles, disk_count, group_size))
+# -------------------------------------------------------------------------------------
+def random_state(disk_count: int, pole_count: int) -> Tuple[Tuple[int, ...], ...]:
+    poles = [[] for _ in range(pole_count)]
+    for size in range(disk_count, 0, -1):
+        poles[random.randrange(pole_count)].append(size)
+    return tuple(tuple(pole) for pole in poles)
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 13
+    pole_total = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    random.seed(0)
+    for _ in range(5):
+        state = random_state(disks, pole_total)
+        started = time.time()
+        solution = astar_solution(state, disks)
+        print(f"{pole_total} poles, {disks} disks: {len(solution)} moves in {time.time() - started:.2f}s")
+# ---------------------------------END-------------------------------------------------
@@ -0,0 +1,160 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Parallel BFS over a pool of worker processes, for large restricted or multi-pole variants.
+# State indices (StateCodec.index) are partitioned by hash: worker w owns every state s with
+# s % workers == w, keeps the visited bitmap and frontier of its own states only, and
+# expands its frontier with the NumPy engine (see hanoi_bfs.py).
+# Every layer has two phases, driven by the main process over pipes:
+#   1) expand: each worker sorts its successors by owner into one shared-memory buffer
+#   2) absorb: each worker reads its slice from every buffer, drops visited states, and
+#      keeps the rest as its next frontier
+# Only offsets and counts go through the pipes; the states themselves are exchanged through
+# one buffer file per worker in /dev/shm (POSIX shared memory on Linux), which avoids the
+# multiprocessing resource tracker unlinking buffers that other workers still read.
+# Usage: python hanoi_parallel_bfs.py <disk_count> [pole_count] [workers]
+# -------------------------------------------------------------------------------------
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import List, Sequence
+
+import numpy as np
+
+from hanoi_bfs import BATCH_SIZE, expand
+from hanoi_state import StateCodec
+# -------------------------------------------------------------------------------------
+def outbox_path(buffer_dir: str, worker: int) -> str:
+    return os.path.join(buffer_dir, f"outbox_{worker:03d}.bin")
+# -------------------------------------------------------------------------------------
+def worker_main(connection, worker: int, workers: int, disk_count: int, pole_count: int, start: int,
+                buffer_dir: str):
+    """Worker loop: owns the states with index % workers == worker"""
+    visited = np.zeros((pole_count ** disk_count // workers + 8) // 8, dtype=np.uint8)
+    frontier = np.empty(0, dtype=np.int64)
+    if start % workers == worker:
+        frontier = np.array([start], dtype=np.int64)
+        local = start // workers
+        visited[local >> 3] |= np.uint8(1 << (local & 7))
+
+    while True:
+        command, argument = connection.recv()
+        if command == "expand":
+            # Successors of the whole frontier, grouped by owning worker
+            parts = [expand(frontier[begin:begin + BATCH_SIZE], disk_count, pole_count)[0]
+                     for begin in range(0, len(frontier), BATCH_SIZE)]
+            successors = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            owners = successors % workers
+            successors = successors[np.argsort(owners, kind='stable')]
+            counts = np.bincount(owners, minlength=workers)
+
+            successors.tofile(outbox_path(buffer_dir, worker))
+            connection.send(counts.tolist())
+
+        elif command == "absorb":
+            # argument: ([(offset, count)] of the states this worker owns in every outbox, stop state)
+            slices, stop = argument
+            parts = [np.fromfile(outbox_path(buffer_dir, sender), dtype=np.int64, count=count, offset=offset * 8)
+                     for sender, (offset, count) in enumerate(slices) if count]
+            states = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            local = states // workers
+            seen = (visited[local >> 3] >> (local & 7).astype(np.uint8)) & 1
+            frontier, local = states[seen == 0], local[seen == 0]
+            np.bitwise_or.at(visited, local >> 3, (1 << (local & 7)).astype(np.uint8))
+            connection.send((len(frontier), bool(stop >= 0 and np.any(frontier == stop))))
+
+        elif command == "quit":
+            connection.close()
+            return
+# -------------------------------------------------------------------------------------
+def parallel_bfs(start: int, disk_count: int, pole_count: int = 3, workers: int = 0,
+                 stop: int = -1) -> List[int]:
+    """
+    Layer sizes of a BFS from a base-P state index, computed by `workers` processes
+    (default: one per CPU). Stops after the layer containing `stop`, if given.
+    """
+    workers = workers or os.cpu_count() or 1
+    buffer_dir = tempfile.mkdtemp(prefix="hanoi_bfs_", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    connections, processes = [], []
+    for worker in range(workers):
+        parent_end, child_end = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=worker_main, daemon=True,
+                                          args=(child_end, worker, workers, disk_count, pole_count, start, buffer_dir))
+        process.start()
+        child_end.close()  # Only the worker uses it: a dead worker then shows up as EOFError on recv
+        connections.append(parent_end)
+        processes.append(process)
+
+    sizes = [1]
+    try:
+        found = start == stop
+        while sizes[-1] and not found:
+            for connection in connections:
+                connection.send(("expand", None))
+            outbox_counts = [connection.recv() for connection in connections]
+
+            # Tell every worker where its states sit in each outbox
+            offsets = [np.concatenate(([0], np.cumsum(counts)[:-1])) for counts in outbox_counts]
+            for worker, connection in enumerate(connections):
+                slices = [(int(offsets[sender][worker]), counts[worker]) for sender, counts in enumerate(outbox_counts)]
+                connection.send(("absorb", (slices, stop)))
+            results = [connection.recv() for connection in connections]
+
+            sizes.append(sum(size for size, _ in results))
+            found = any(hit for _, hit in results)
+    finally:
+        # Every step on its own: one dead worker must not keep the others running or the buffers on disk
+        try:
+            for connection in connections:
+                try:
+                    connection.send(("quit", None))
+                except OSError:
+                    pass  # Worker already gone (broken pipe)
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            for connection in connections:
+                connection.close()
+        finally:
+            shutil.rmtree(buffer_dir, ignore_errors=True)
+
+    if not sizes[-1]:
+        sizes.pop()  # The empty layer after the last one
+    return sizes
+# -------------------------------------------------------------------------------------
+def parallel_bfs_distance(poles: Sequence[Sequence[int]], disk_count: int, workers: int = 0) -> int:
+    """Minimal number of moves to the rightmost pole, for any pole count"""
+    codec = StateCodec(disk_count, len(poles))
+    goal = codec.index(codec.goal())
+    return len(parallel_bfs(codec.index(codec.encode(poles)), disk_count, len(poles), workers, goal)) - 1
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    poles = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    pool_size = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    # Check the partition exchange against the single-process BFS on small boards, with a worker
+    # count that does not divide the state count, and the early stop at the goal
+    from hanoi_bfs import iter_layers
+    for check_poles, check_disks in ((3, 7), (4, 6), (5, 5)):
+        expected = [len(layer) for layer in iter_layers(0, check_disks, check_poles)]
+        sizes = parallel_bfs(0, check_disks, check_poles, workers=3)
+        assert sizes == expected, (check_poles, check_disks, sizes, expected)
+
+        codec = StateCodec(check_disks, check_poles)
+        start = codec.from_index(check_poles ** check_disks // 3)
+        goal = codec.index(codec.goal())
+        expected = len(list(iter_layers(codec.index(start), check_disks, check_poles, goal))) - 1
+        assert parallel_bfs_distance(codec.decode(start), check_disks, workers=3) == expected
+    print("Matches the single-process BFS with 3 workers")
+
+    started = time.time()
+    layer_sizes = parallel_bfs(0, disks, poles, pool_size)
+    print(f"{poles} poles, {disks} disks, {pool_size or os.cpu_count()} workers: {sum(layer_sizes)} states "
+          f"in {len(layer_sizes)} layers in {time.time() - started:.2f}s")
+# ---------------------------------END-------------------------------------------------
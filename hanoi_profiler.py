@@ -0,0 +1,87 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Per-frame profiler for the pygame main loop: times each phase of a frame (event handling,
+# HanoiCore.update, HanoiGame.draw, display update) plus the solver time the core reports,
+# keeps the last PROFILE_FRAMES frames, summarizes them (FPS, p50/p99 frame time) for the
+# on-screen overlay and exports them as JSON or CSV to look for hitches on slow machines.
+# No pygame import: the game loop calls begin_frame/phase/end_frame around its own work.
+# -------------------------------------------------------------------------------------
+import collections
+import contextlib
+import csv
+import json
+import time
+from typing import Dict, Optional
+
+PHASES = ("events", "update", "draw", "flip")  # Work done per frame, in loop order
+PROFILE_FRAMES = 10_000  # Frames kept for the summary and the export (about 3 minutes at 60 fps)
+# -------------------------------------------------------------------------------------
+class FrameProfiler:
+    """
+    One sample per frame: start time, seconds spent in each phase, their total (the frame's
+    work, without the time the loop sleeps waiting for events) and the solver time.
+    Solver time is spent inside the other phases, so it is not part of the total again.
+    """
+    def __init__(self, max_frames: int = PROFILE_FRAMES):
+        self.samples = collections.deque(maxlen=max_frames)
+        self.current: Dict[str, float] = {}
+        self.frame_start = 0.0
+        self.frame_count = 0
+    # ----------------------------------------
+    def begin_frame(self):
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = time.perf_counter()
+    # ----------------------------------------
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Add the time spent in the with-block to the current frame's phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter() - started
+    # ----------------------------------------
+    def end_frame(self, solver_seconds: float = 0.0):
+        sample = {"frame": self.frame_count, "start": self.frame_start}
+        sample.update(self.current)
+        sample["total"] = sum(self.current.values())
+        sample["solver"] = solver_seconds
+        self.samples.append(sample)
+        self.frame_count += 1
+    # ----------------------------------------
+    def summary(self, frames: Optional[int] = None) -> Dict[str, float]:
+        """
+        FPS over the last `frames` samples (all by default), p50/p99 of their frame work time,
+        the mean of every phase and the solver time, all in seconds
+        """
+        samples = list(self.samples)[-frames:] if frames else list(self.samples)
+        if not samples:
+            return {}
+        totals = sorted(sample["total"] for sample in samples)
+        span = samples[-1]["start"] - samples[0]["start"]
+        result = {
+            "frames": len(samples),
+            "fps": (len(samples) - 1) / span if span > 0 else 0.0,
+            "p50": totals[len(totals) // 2],
+            "p99": totals[min(len(totals) - 1, int(len(totals) * 0.99))],
+            "max": totals[-1],
+            "solver": sum(sample["solver"] for sample in samples),
+        }
+        for name in PHASES:
+            result[name] = sum(sample[name] for sample in samples) / len(samples)
+        return result
+    # ----------------------------------------
+    def export(self, path: str):
+        """Write every kept sample, as CSV when the path ends in .csv, otherwise as JSON"""
+        samples = list(self.samples)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["frame", "start", *PHASES, "total", "solver"])
+                writer.writeheader()
+                writer.writerows(samples)
+        else:
+            with open(path, "w") as f:
+                json.dump({"phases": PHASES, "summary": self.summary(), "samples": samples}, f, indent=1)
+                f.write("\n")
+# ---------------------------------END-------------------------------------------------
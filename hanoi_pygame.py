@@ -5,18 +5,21 @@
 # Two modes:
 # 1) Manual: Play and solve the puzzle yourself by moving disks.
 # 2) Auto: Watch the shortest solution found for the current state.
-# Optimal Moves Calculation: Shows the minimal number of moves required from the current state (using BFS).
+# Optimal Moves Calculation: Shows the minimal number of moves required from the current state (closed form, BFS as check).
 # Scoring: Get a score based on how close you are to the optimal solution.
 # Interactive GUI: Click to select and move disks, or use buttons to switch modes or start a new game.
 # Customizable Disk Count: Easily modify the number of disks between 3 and 8.
+# Rendering only: the game rules and solvers run headless in hanoi_core.HanoiCore.
+# Usage: python hanoi_pygame.py [profile.json|profile.csv] (frame timings written on exit)
 # -------------------------------------------------------------------------------------
+import collections
 import pygame
 import sys
-import random
 import time
-from typing import List, Tuple, Optional
-import collections
-import math
+from typing import List, Optional, Tuple
+
+from hanoi_core import DISK_COUNT, MAX_DISKS, POLE_COUNT, HanoiCore
+from hanoi_profiler import FrameProfiler
 
 # Initialize pygame
 pygame.init()
@@ -24,7 +27,6 @@ pygame.init()
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-POLE_COUNT = 3
 POLE_COLOR = (200, 200, 200)  # Light gray poles
 DISK_COLORS = [
     (255, 0, 0),  # Red
@@ -41,20 +43,45 @@ TEXT_COLOR = (255, 255, 255)  # White text
 PANEL_COLOR = (80, 80, 80)  # Darker gray panel
 BUTTON_COLOR = (100, 100, 100)  # Gray for buttons
 BUTTON_HOVER_COLOR = (120, 120, 120)  # Lighter gray for button hover
+HINT_COLOR = (0, 255, 128)  # Green outline for the hinted move
 
-# Auto-solve speed control
-MIN_AUTO_DELAY = 0.1   # Fastest speed (100ms between moves)
-MAX_AUTO_DELAY = 2.0   # Slowest speed (2 seconds between moves)
-AUTO_DELAY_STEP = 0.1  # Speed adjustment increment
-
-# Disk settings
-MAX_DISKS = 8
-MIN_DISKS = 3
+# Disk settings (pole count, disk count and speed limits live in hanoi_core.py)
 DISK_HEIGHT = 30
 MIN_DISK_WIDTH = 40
 DISK_WIDTH_INCREMENT = 20
+LIFT_Y = SCREEN_HEIGHT - 350 - 100 - DISK_HEIGHT - 10  # Disks in flight pass just above the pole tops
+SELECTION_MARGIN = 2  # Selection highlight drawn around the disk
+ATLAS_COLORKEY = (255, 0, 254)  # Transparent margin of the disk sprites (not a disk colour)
+
+PANEL_AREA = pygame.Rect(0, 0, SCREEN_WIDTH, 125)  # Info panel and buttons
+PROFILE_AREA = pygame.Rect(10, SCREEN_HEIGHT - 85, 600, 75)  # Performance overlay, below the disks
+PROFILE_REFRESH = 0.5  # Seconds between overlay text updates, so the numbers stay readable
+PROFILE_WINDOW = 120   # Frames summarized by the overlay
 
-DISK_COUNT = 5
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept around (labels, panel lines, disk numbers)
+# -------------------------------------------------------------------------------------
+class TextCache:
+    """
+    Rendered text surfaces keyed by (text, font, colour), so unchanged labels are not
+    rendered again every frame. The least recently used surface is evicted when full.
+    """
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = collections.OrderedDict()
+    # ----------------------------------------
+    def render(self, font, text: str, color: Tuple[int, int, int]):
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+# -------------------------------------------------------------------------------------
+text_cache = TextCache()
 # -------------------------------------------------------------------------------------
 class Disk:
     def __init__(self, size: int, color: Tuple[int, int, int]):
@@ -72,38 +99,15 @@ class Disk:
         pygame.draw.rect(screen, (0, 0, 0), (x, y, self.width, DISK_HEIGHT), 1)
 
         # Draw number on disk
-        number_text = font.render(str(self.size), True, (0, 0, 0))  # Black numbers for contrast
+        number_text = text_cache.render(font, str(self.size), (0, 0, 0))  # Black numbers for contrast
         text_rect = number_text.get_rect(center=(x + self.width // 2, y + DISK_HEIGHT // 2))
         screen.blit(number_text, text_rect)
 
         # Draw selection highlight
         if self.selected:
-            pygame.draw.rect(screen, (255, 255, 0), (x - 2, y - 2, self.width + 4, DISK_HEIGHT + 4), 2)
-# -------------------------------------------------------------------------------------
-class Pole:
-    def __init__(self, x: int):
-        self.x = x
-        self.disks: List[Disk] = []
-    # ----------------------------------------
-    def add_disk(self, disk: Disk):
-        self.disks.append(disk)
-    # ----------------------------------------
-    def remove_disk(self) -> Disk:
-        if self.disks:
-            return self.disks.pop()
-        return None
-    # ----------------------------------------
-    def top_disk(self) -> Optional[Disk]:
-        if self.disks:
-            return self.disks[-1]
-        return None
-    # ----------------------------------------
-    def is_valid(self) -> bool:
-        # Check if disks are in correct order (smallest on top)
-        for i in range(1, len(self.disks)):
-            if self.disks[i].size < self.disks[i - 1].size:
-                return False
-        return True
+            pygame.draw.rect(screen, (255, 255, 0), (x - SELECTION_MARGIN, y - SELECTION_MARGIN,
+                                                     self.width + 2 * SELECTION_MARGIN,
+                                                     DISK_HEIGHT + 2 * SELECTION_MARGIN), 2)
 # -------------------------------------------------------------------------------------
 class Button:
     def __init__(self, x: int, y: int, width: int, height: int, text: str):
@@ -116,7 +120,7 @@ class Button:
         pygame.draw.rect(screen, color, self.rect)
         pygame.draw.rect(screen, TEXT_COLOR, self.rect, 2)  # Border
 
-        text_surface = font.render(self.text, True, TEXT_COLOR)
+        text_surface = text_cache.render(font, self.text, TEXT_COLOR)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
     # ----------------------------------------
@@ -129,27 +133,15 @@ class Button:
             return self.rect.collidepoint(pos)
         return False
 # -------------------------------------------------------------------------------------
-class HanoiGame:
-    def __init__(self, disk_count: int = 5):
-        self.disk_count = disk_count
-        self.poles = [Pole((i + 1) * SCREEN_WIDTH // (POLE_COUNT + 1)) for i in range(POLE_COUNT)]
-        self.selected_pole = None
-        self.moves = 0
+class HanoiGame(HanoiCore):
+    """pygame front end: draws the core state and maps mouse clicks onto it"""
+    def __init__(self, disk_count: int = 5, pole_count: int = POLE_COUNT):
         self.font = pygame.font.SysFont('Arial', 20)
         self.disk_font = pygame.font.SysFont('Arial', 16)
-        self.mode = "manual"  # "manual" or "auto"
-        self.auto_solving = False
-        self.auto_move_delay = 0.5  # seconds between auto moves
-        self.last_auto_move_time = 0
-        self.move_sequence = []
-        self.optimal_moves = 0
-        self.user_score = 0
-        self.solved = False
-        
-        # Win message display control
-        self.show_win_message_flag = False
-        self.win_message_start_time = 0
-        self.win_message_duration = 3.0  # seconds
+        self.pole_x = [(i + 1) * SCREEN_WIDTH // (pole_count + 1) for i in range(pole_count)]
+        self.atlas = None  # Disk sprites, baked by build_disk_atlas for the current disk count
+        self.atlas_cells = {}  # size -> (normal, selected) area of the atlas
+        self.atlas_disk_count = 0
 
         # Buttons
         button_width = 120
@@ -158,184 +150,221 @@ class HanoiGame:
         self.manual_solve_button = Button(160, 80, button_width, button_height, "Manual Solve")
         self.new_game_button = Button(300, 80, button_width, button_height, "New Game")
 
-        self.generate_random_initial_state()
-    # ----------------------------------------
-    def adjust_speed(self, increase: bool):
-        """Adjust auto-solve speed using arrow keys"""
-        if increase:
-            self.auto_move_delay = max(MIN_AUTO_DELAY, self.auto_move_delay - AUTO_DELAY_STEP)
-        else:
-            self.auto_move_delay = min(MAX_AUTO_DELAY, self.auto_move_delay + AUTO_DELAY_STEP)
-
-        # Show speed change feedback
-        speed_multiplier = 1 / self.auto_move_delay
-        print(f"Auto-solve speed: {speed_multiplier:.1f}x speed ({self.auto_move_delay:.1f}s delay)")
-    # ----------------------------------------
-    def generate_random_initial_state(self):
-        # Clear all poles
-        for pole in self.poles:
-            pole.disks = []
-
-        # Create disks
-        disks = [Disk(size + 1, DISK_COLORS[size % len(DISK_COLORS)]) for size in range(self.disk_count)]
-
-        # Distribute disks randomly across poles while maintaining valid state
-        for disk in reversed(disks):  # Start with largest disk
-            valid_poles = []
-            for pole in self.poles:
-                if not pole.disks or pole.top_disk().size > disk.size:
-                    valid_poles.append(pole)
-
-            if valid_poles:
-                random.choice(valid_poles).add_disk(disk)
-
-        # Make sure at least one disk is not on the rightmost pole
-        if len(self.poles[-1].disks) == self.disk_count:
-            # Move one disk to another pole
-            disk_to_move = self.poles[-1].remove_disk()
-            self.poles[0].add_disk(disk_to_move)
-
-        self.moves = 0
-        self.selected_pole = None
-        self.auto_solving = False
-        self.move_sequence = []
-        self.optimal_moves = self.calculate_optimal_moves()
-        self.user_score = 0
-        self.solved = False
-        self.show_win_message_flag = False
-        self.win_message_start_time = 0
+        # Screen regions for dirty-rectangle updates: one column per pole, wide enough for the
+        # largest disk and its selection border, below the panel
+        column_width = MIN_DISK_WIDTH + (max(MAX_DISKS, disk_count) - 1) * DISK_WIDTH_INCREMENT + 6
+        self.pole_rects = [pygame.Rect(x - column_width // 2, PANEL_AREA.bottom, column_width,
+                                       SCREEN_HEIGHT - PANEL_AREA.bottom) for x in self.pole_x]
+        self.win_message_rect = pygame.Rect(0, 0, 600, 100)
+        self.win_message_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.drawn = {}  # region_keys() of what is currently on screen
+        self.show_hint = False  # Toggled with H in manual mode
+        self.shown_hint = None  # (source, target) highlighted on screen
+
+        super().__init__(disk_count, pole_count)
     # ----------------------------------------
-    def calculate_optimal_moves(self) -> int:
-        """
-        Calculate the minimal moves needed to solve from current state using BFS.
-        Returns the number of moves in the optimal solution.
-        """
-        # Represent the state as a tuple of tuples (for hashing)
-        initial_state = tuple(tuple(disk.size for disk in pole.disks) for pole in self.poles)
-        goal_state = ((), (), tuple(range(self.disk_count, 0, -1)))
-
-        # If already in goal state, no moves needed
-        if initial_state == goal_state:
-            return 0
-
-        # BFS setup
-        queue = collections.deque([(initial_state, 0)])
-        visited = {initial_state}
-
-        while queue:
-            current_state, moves = queue.popleft()
-
-            # Check if we've reached the goal
-            if current_state == goal_state:
-                return moves
-
-            # Generate all possible next states
-            for src in range(3):
-                if not current_state[src]:  # No disks to move from this pole
-                    continue
-
-                # We can only move the top disk
-                disk_size = current_state[src][-1]
-
-                for dst in range(3):
-                    if src == dst:
-                        continue  # Can't move to same pole
-
-                    # Check if move is valid (empty destination or larger disk)
-                    if not current_state[dst] or current_state[dst][-1] > disk_size:
-                        # Create new state
-                        new_state = list(list(pole) for pole in current_state)
-                        disk = new_state[src].pop()
-                        new_state[dst].append(disk)
-                        new_state_tuple = tuple(tuple(pole) for pole in new_state)
-
-                        # If we haven't seen this state before
-                        if new_state_tuple not in visited:
-                            visited.add(new_state_tuple)
-                            queue.append((new_state_tuple, moves + 1))
-
-        return -1  # Should never happen for valid initial states
+    def invalidate(self):
+        """Forget what is on screen, so the next draw repaints everything"""
+        self.drawn = {}
     # ----------------------------------------
-    def draw(self, screen):
-        screen.fill(BACKGROUND_COLOR)
-
-        # Draw panel
-        pygame.draw.rect(screen, PANEL_COLOR, (10, 10, 780, 110))
-
+    def panel_lines(self) -> Tuple[str, str]:
+        """The two info panel lines"""
         # Prepare mode-specific instructions
         mode_instructions = ""
         if self.mode == "auto" and self.auto_solving:
-            mode_instructions = "↑/↓: Change speed"
+            mode_instructions = "↑/↓: Change speed | T: Turbo"
         elif self.mode == "manual":
-            mode_instructions = "Click poles to move disks"
+            mode_instructions = "Click poles to move disks | H: Hint"
 
-        # Draw game info (two lines)
         mode_text = "Auto" if self.mode == "auto" else "Manual"
-        info_line1 = self.font.render(
-            f"Moves: {self.moves} | Disks: {self.disk_count} | Mode: {mode_text} | "
-            f"Optimal: {self.optimal_moves} | Score: {self.user_score}%",
-            True, TEXT_COLOR
-        )
+        if self.turbo:
+            speed = f"Turbo: {self.turbo_move_rate} moves/s (playing {self.turbo_measured_rate:.0f}/s)"
+        else:
+            speed = f"Speed: {1 / self.auto_move_delay:.1f}x"
+        if self.custom_goal is not None:
+            left = f"{self.auto_moves_left} to custom goal"
+        else:
+            left = f"{self.remaining_moves} ({self.remaining_change:+d})"
+        return (f"Moves: {self.moves} | Disks: {self.disk_count} | Mode: {mode_text} | "
+                f"Optimal: {self.optimal_moves} | Left: {left} | "
+                f"Score: {self.user_score}%",
+                f"{speed} | {mode_instructions} | "
+                f"Goal: Move all disks to rightmost pole")
+    # ----------------------------------------
+    def region_keys(self) -> dict:
+        """What every screen region shows; a region is redrawn only when its key changes"""
+        keys = {
+            "panel": (self.panel_lines(), self.auto_solve_button.hovered,
+                      self.manual_solve_button.hovered, self.new_game_button.hovered),
+            "overlay": self.show_win_message_flag and (self.moves, self.optimal_moves, self.user_score),
+        }
+        self.shown_hint = None
+        if self.show_hint and self.mode == "manual" and not self.solved:
+            self.shown_hint = self.hint()
+        for i, pole in enumerate(self.poles):
+            keys[i] = (tuple(pole), self.selected_pole == i, self.shown_hint and i in self.shown_hint and self.shown_hint)
+        keys["moving"] = self.animation and (self.animation, self.moving_disk_position())
+        return keys
+    # ----------------------------------------
+    def draw(self, screen) -> List[pygame.Rect]:
+        """
+        Draw what changed since the last call and return the dirty rectangles
+        (for pygame.display.update). Returns [] when the screen is already up to date.
+        """
+        keys = self.region_keys()
+        if keys["overlay"] != self.drawn.get("overlay"):
+            # The win message covers panel-free parts of several poles: repaint everything
+            screen.fill(BACKGROUND_COLOR)
+            self.draw_panel(screen)
+            self.draw_poles(screen)
+            if self.show_win_message_flag:
+                self.draw_win_message(screen)
+            self.drawn = keys
+            return [screen.get_rect()]
+
+        dirty = []
+        if keys["panel"] != self.drawn["panel"]:
+            screen.fill(BACKGROUND_COLOR, PANEL_AREA)
+            self.draw_panel(screen)
+            dirty.append(PANEL_AREA)
+
+        changed = [self.pole_rects[i] for i in range(self.pole_count) if keys[i] != self.drawn[i]]
+        if keys["moving"] != self.drawn["moving"]:
+            # The disk in flight stays between its two poles: repaint those columns, now and where it was
+            for moving in (keys["moving"], self.drawn["moving"]):
+                if moving:
+                    (_, from_pole, to_pole), _ = moving
+                    changed += [self.pole_rects[from_pole], self.pole_rects[to_pole]]
+        if changed:
+            # Wide disks reach into the neighbouring columns, so repaint all poles clipped to the change
+            area = changed[0].unionall(changed[1:])
+            screen.set_clip(area)
+            screen.fill(BACKGROUND_COLOR)
+            self.draw_poles(screen)
+            screen.set_clip(None)
+            dirty.append(area)
+
+        if dirty and self.show_win_message_flag:
+            self.draw_win_message(screen)
+            dirty.append(self.win_message_rect)
 
-        info_line2 = self.font.render(
-            f"Speed: {1 / self.auto_move_delay:.1f}x | {mode_instructions} | "
-            f"Goal: Move all disks to rightmost pole",
-            True, TEXT_COLOR
-        )
+        self.drawn = keys
+        return dirty
+    # ----------------------------------------
+    def draw_panel(self, screen):
+        pygame.draw.rect(screen, PANEL_COLOR, (10, 10, 780, 110))
 
-        screen.blit(info_line1, (20, 20))
-        screen.blit(info_line2, (20, 45))
+        # Draw game info (two lines)
+        line1, line2 = self.panel_lines()
+        screen.blit(text_cache.render(self.font, line1, TEXT_COLOR), (20, 20))
+        screen.blit(text_cache.render(self.font, line2, TEXT_COLOR), (20, 45))
 
         # Draw buttons
         self.auto_solve_button.draw(screen, self.font)
         self.manual_solve_button.draw(screen, self.font)
         self.new_game_button.draw(screen, self.font)
+    # ----------------------------------------
+    def build_disk_atlas(self):
+        """
+        Bake every disk sprite (fill, border, number, and the selected variant) into one surface:
+        one row per size, normal sprite on the left, selected on the right. Sprites have a
+        SELECTION_MARGIN border for the highlight; the unused margin is a transparent colour key.
+        """
+        disks = [Disk(size, DISK_COLORS[(size - 1) % len(DISK_COLORS)]) for size in range(1, self.disk_count + 1)]
+        cell_width = disks[-1].width + 2 * SELECTION_MARGIN
+        cell_height = DISK_HEIGHT + 2 * SELECTION_MARGIN
+        atlas = pygame.Surface((2 * cell_width, len(disks) * cell_height))
+        atlas.fill(ATLAS_COLORKEY)
+
+        self.atlas_cells = {}
+        for row, disk in enumerate(disks):
+            cells = []
+            for column, selected in enumerate((False, True)):
+                disk.selected = selected
+                disk.draw(atlas, column * cell_width + SELECTION_MARGIN, row * cell_height + SELECTION_MARGIN,
+                          self.disk_font)
+                cells.append(pygame.Rect(column * cell_width, row * cell_height,
+                                         disk.width + 2 * SELECTION_MARGIN, cell_height))
+            self.atlas_cells[disk.size] = tuple(cells)
+
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert()  # Match the screen's pixel format
+        atlas.set_colorkey(ATLAS_COLORKEY, pygame.RLEACCEL)
+        self.atlas = atlas
+        self.atlas_disk_count = self.disk_count
+    # ----------------------------------------
+    def moving_disk_position(self) -> Tuple[int, int]:
+        """
+        Centre x and top y of the disk in flight, interpolated between the last two simulation steps.
+        The path lifts the disk above the source pole, slides it across and drops it on the target
+        stack, at constant speed along the whole path.
+        """
+        _, from_pole, to_pole = self.animation
+        start_y = SCREEN_HEIGHT - 100 - (len(self.poles[from_pole]) + 1) * DISK_HEIGHT
+        end_y = SCREEN_HEIGHT - 100 - len(self.poles[to_pole]) * DISK_HEIGHT
+        lift_y = max(PANEL_AREA.bottom + SELECTION_MARGIN, min(LIFT_Y, start_y, end_y))
+        start_x, end_x = self.pole_x[from_pole], self.pole_x[to_pole]
+
+        lift, slide, drop = start_y - lift_y, abs(end_x - start_x), end_y - lift_y
+        distance = self.interpolated_animation_progress() * (lift + slide + drop)
+        if distance < lift:
+            return start_x, round(start_y - distance)
+        if distance < lift + slide:
+            direction = 1 if end_x > start_x else -1
+            return round(start_x + direction * (distance - lift)), lift_y
+        return end_x, round(lift_y + distance - lift - slide)
+    # ----------------------------------------
+    def draw_poles(self, screen):
+        if self.atlas_disk_count != self.disk_count:
+            self.build_disk_atlas()
+        in_flight = self.animation[2] if self.animation else -1  # Its disk is drawn on its way there
 
         # Draw poles (without bases)
         pole_height = SCREEN_HEIGHT - 350
         pole_width = 10
         pole_y_start = SCREEN_HEIGHT - 100 - pole_height
 
-        for pole in self.poles:
+        for pole_idx, (pole, pole_x) in enumerate(zip(self.poles, self.pole_x)):
             # Draw pole stand only (vertical line)
             pygame.draw.rect(screen, POLE_COLOR,
-                             (pole.x - pole_width // 2, pole_y_start,
+                             (pole_x - pole_width // 2, pole_y_start,
                               pole_width, pole_height))
 
-            # Draw disks
-            for i, disk in enumerate(pole.disks):
-                disk_y = SCREEN_HEIGHT - 100 - (i + 1) * DISK_HEIGHT
-                disk_x = pole.x - disk.width // 2
-                disk.draw(screen, disk_x, disk_y, self.disk_font)
-
-        # Draw win message if needed
-        if self.show_win_message_flag:
-            self.draw_win_message(screen)
+            # Draw disks: one batched blit of atlas cells per pole
+            top = len(pole) - 1 if pole_idx == self.selected_pole else -1
+            sprites = []
+            for i, size in enumerate(pole[:-1] if pole_idx == in_flight else pole):
+                cell = self.atlas_cells[size][i == top]
+                disk_y = SCREEN_HEIGHT - 100 - (i + 1) * DISK_HEIGHT - SELECTION_MARGIN
+                sprites.append((self.atlas, (pole_x - cell.width // 2, disk_y), cell))
+            screen.blits(sprites, doreturn=False)
+
+            # Hint: outline the disk to move and where it lands
+            if self.shown_hint and pole_idx in self.shown_hint and self.poles[self.shown_hint[0]]:
+                width = self.atlas_cells[self.poles[self.shown_hint[0]][-1]][0].width
+                level = len(pole) if pole_idx == self.shown_hint[1] else len(pole) - 1
+                disk_y = SCREEN_HEIGHT - 100 - (level + 1) * DISK_HEIGHT - SELECTION_MARGIN
+                pygame.draw.rect(screen, HINT_COLOR, (pole_x - width // 2, disk_y, width,
+                                                      DISK_HEIGHT + 2 * SELECTION_MARGIN), 2)
+
+        if self.animation:
+            cell = self.atlas_cells[self.animation[0]][False]
+            disk_x, disk_y = self.moving_disk_position()
+            screen.blit(self.atlas, (disk_x - cell.width // 2, disk_y - SELECTION_MARGIN), cell)
     # ----------------------------------------
     def draw_win_message(self, screen):
         """Draw the win message overlay"""
-        # Calculate performance rating
-        rating = ""
-        if self.moves == self.optimal_moves:
-            rating = "Perfect! You matched the optimal solution!"
-        elif self.moves <= self.optimal_moves * 1.2:
-            rating = "Excellent! Very close to optimal!"
-        elif self.moves <= self.optimal_moves * 1.5:
-            rating = "Good! You can still improve."
-        else:
-            rating = "Keep practicing! Try to find more efficient solutions."
-
         # Create a surface for the win message
         msg_surface = pygame.Surface((600, 100))
         msg_surface.fill(PANEL_COLOR)
         pygame.draw.rect(msg_surface, TEXT_COLOR, msg_surface.get_rect(), 2)
 
         # Render text lines
-        line1 = self.font.render(f"Solved in {self.moves} moves (optimal: {self.optimal_moves})", True, TEXT_COLOR)
-        line2 = self.font.render(f"Score: {self.user_score}% - {rating}", True, TEXT_COLOR)
+        line1 = text_cache.render(self.font, f"Solved in {self.moves} moves (optimal: {self.optimal_moves})", TEXT_COLOR)
+        line2 = text_cache.render(self.font, f"Score: {self.user_score}% - {self.rating()}", TEXT_COLOR)
 
         # Center the message on screen
-        msg_rect = msg_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        msg_rect = self.win_message_rect
 
         # Blit everything
         screen.blit(msg_surface, msg_rect)
@@ -354,169 +383,33 @@ class HanoiGame:
             self.generate_random_initial_state()
             return
 
-        # Handle pole clicks only in manual mode
-        if self.mode != "manual" or self.auto_solving:
-            return
-
         x, y = pos
 
         # Check if click is on a pole
-        for i, pole in enumerate(self.poles):
-            if abs(x - pole.x) < 50 and y > SCREEN_HEIGHT - 400:
-                if self.selected_pole is None:
-                    # Select the pole if it has disks
-                    if pole.disks:
-                        self.selected_pole = i
-                        pole.top_disk().selected = True
-                else:
-                    # Try to move disk from selected pole to this pole
-                    if self.selected_pole != i:
-                        self.move_disk(self.selected_pole, i)
-
-                    # Deselect in any case
-                    if self.selected_pole is not None and self.poles[self.selected_pole].disks:
-                        self.poles[self.selected_pole].top_disk().selected = False
-                    self.selected_pole = None
+        for i, pole_x in enumerate(self.pole_x):
+            if abs(x - pole_x) < 50 and y > SCREEN_HEIGHT - 400:
+                self.click_pole(i)
                 break
-    # ----------------------------------------
-    def set_mode(self, mode: str):
-        self.mode = mode
-        if mode == "auto":
-            self.prepare_auto_solve()
-    # ----------------------------------------
-    def prepare_auto_solve(self):
-        """
-        Use BFS to find the shortest sequence of moves from the current state to the goal.
-        """
-        self.move_sequence = []
-        self.auto_solving = True
-        self.last_auto_move_time = time.time()
-
-        # Represent the state as a tuple of tuples (for hashing)
-        initial_state = tuple(tuple(disk.size for disk in pole.disks) for pole in self.poles)
-        goal_state = ((), (), tuple(range(self.disk_count, 0, -1)))
-
-        # If already in goal state, do nothing
-        if initial_state == goal_state:
-            return
-
-        # BFS setup
-        queue = collections.deque([initial_state])
-        visited = {initial_state: None}  # state -> (prev_state, move)
-        found = False
-
-        while queue:
-            current_state = queue.popleft()
-
-            # Check if we've reached the goal
-            if current_state == goal_state:
-                found = True
-                break
-
-            # Generate all possible next states
-            for src in range(3):
-                if not current_state[src]:  # No disks to move from this pole
-                    continue
-
-                # We can only move the top disk
-                disk_size = current_state[src][-1]
-
-                for dst in range(3):
-                    if src == dst:
-                        continue  # Can't move to same pole
-
-                    # Check if move is valid (empty destination or larger disk)
-                    if not current_state[dst] or current_state[dst][-1] > disk_size:
-                        # Create new state
-                        new_state = list(list(pole) for pole in current_state)
-                        disk = new_state[src].pop()
-                        new_state[dst].append(disk)
-                        new_state_tuple = tuple(tuple(pole) for pole in new_state)
-
-                        # If we haven't seen this state before
-                        if new_state_tuple not in visited:
-                            visited[new_state_tuple] = (current_state, (src, dst))
-                            queue.append(new_state_tuple)
-
-        if found:
-            # Reconstruct the path
-            path = []
-            state = goal_state
-            while visited[state] is not None:
-                prev_state, move = visited[state]
-                path.append(move)
-                state = prev_state
-
-            # Reverse to get from initial to goal
-            self.move_sequence = list(reversed(path))
-        else:
-            print("No solution found!")
-            self.auto_solving = False
-    # ----------------------------------------
-    def update(self):
-        # Handle win message timing
-        if self.show_win_message_flag:
-            current_time = time.time()
-            if current_time - self.win_message_start_time >= self.win_message_duration:
-                self.show_win_message_flag = False
-
-        # Handle auto-solving
-        if self.mode == "auto" and self.auto_solving and self.move_sequence:
-            current_time = time.time()
-            if current_time - self.last_auto_move_time >= self.auto_move_delay:
-                source, target = self.move_sequence.pop(0)
-                self.move_disk(source, target)
-                self.last_auto_move_time = current_time
-
-                # Check if we're done
-                if not self.move_sequence:
-                    self.auto_solving = False
-    # ----------------------------------------
-    def move_disk(self, from_pole_idx: int, to_pole_idx: int):
-        from_pole = self.poles[from_pole_idx]
-        to_pole = self.poles[to_pole_idx]
-
-        if not from_pole.disks:
-            return False
-
-        disk_to_move = from_pole.top_disk()
-
-        # Check if move is valid
-        if to_pole.disks and to_pole.top_disk().size < disk_to_move.size:
-            return False
-
-        # Perform the move
-        from_pole.remove_disk()
-        to_pole.add_disk(disk_to_move)
-        self.moves += 1
-
-        # Check for win condition (all disks on rightmost pole)
-        if len(self.poles[-1].disks) == self.disk_count and not self.solved:
-            self.solved = True
-            self.calculate_user_score()
-            # Start showing win message (non-blocking)
-            self.show_win_message_flag = True
-            self.win_message_start_time = time.time()
-
-        return True
-    # ----------------------------------------
-    def calculate_user_score(self):
-        """Calculate user's score based on moves taken vs optimal moves"""
-        if self.optimal_moves > 0:
-            # Score is percentage where optimal moves = 100%
-            # Minimum score is 100% (if user matches optimal)
-            # Higher moves give lower percentage
-            self.user_score = min(100, int((self.optimal_moves / max(1, self.moves)) * 100))
-        else:
-            self.user_score = 100  # If optimal is 0 (already solved)
-    # ----------------------------------------
-    def is_valid_state(self) -> bool:
-        for pole in self.poles:
-            if not pole.is_valid():
-                return False
-        return True
 # -------------------------------------------------------------------------------------
-def main():
+def profile_overlay_lines(profiler: FrameProfiler) -> Tuple[str, ...]:
+    """The performance overlay lines, for the last PROFILE_WINDOW frames (times in ms)"""
+    stats = profiler.summary(PROFILE_WINDOW)
+    if not stats:
+        return ("Collecting frames...",)
+    return (f"FPS: {stats['fps']:.1f} | Frame p50: {stats['p50'] * 1000:.2f} ms | "
+            f"p99: {stats['p99'] * 1000:.2f} ms | Max: {stats['max'] * 1000:.2f} ms",
+            f"Events: {stats['events'] * 1000:.2f} | Update: {stats['update'] * 1000:.2f} | "
+            f"Draw: {stats['draw'] * 1000:.2f} | Flip: {stats['flip'] * 1000:.2f} ms per frame",
+            f"Solver: {stats['solver'] * 1000:.2f} ms in the last {stats['frames']} frames | P: Hide")
+# -------------------------------------------------------------------------------------
+def draw_profile_overlay(screen, font, lines: Optional[Tuple[str, ...]]) -> pygame.Rect:
+    """Draw the overlay lines (or clear the overlay area when None) and return the area"""
+    screen.fill(BACKGROUND_COLOR, PROFILE_AREA)
+    for i, line in enumerate(lines or ()):
+        screen.blit(text_cache.render(font, line, TEXT_COLOR), (PROFILE_AREA.x, PROFILE_AREA.y + i * 24))
+    return PROFILE_AREA
+# -------------------------------------------------------------------------------------
+def main(profile_path: Optional[str] = None):
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Tower of Hanoi with Random Initial State")
 
@@ -525,40 +418,88 @@ def main():
     disk_count = DISK_COUNT
     game = HanoiGame(disk_count)
 
+    # Frame profiler: P toggles the overlay; the samples are written to profile_path on exit
+    profiler = FrameProfiler()
+    show_profile = False
+    profile_shown = False  # Overlay currently on screen
+    profile_lines = None
+    profile_refresh_time = 0.0
+
     running = True
     while running:
-        mouse_pos = pygame.mouse.get_pos()
-        game.auto_solve_button.check_hover(mouse_pos)
-        game.manual_solve_button.check_hover(mouse_pos)
-        game.new_game_button.check_hover(mouse_pos)
-
-        for event in pygame.event.get():
-
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    game.generate_random_initial_state()
-                elif event.key == pygame.K_UP:  # Speed up
-                    game.adjust_speed(True)
-                elif event.key == pygame.K_DOWN:  # Slow down
-                    game.adjust_speed(False)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                game.handle_click(mouse_pos, event)
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    game.generate_random_initial_state()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                game.handle_click(mouse_pos, event)
-
-        game.update()
-        game.draw(screen)
-        pygame.display.flip()
-        clock.tick(60)
-
+        # Sleep until the next event, or until the next auto move / win message timeout
+        wait = game.seconds_until_update()
+        if wait is None:
+            events = [pygame.event.wait()]
+        else:
+            events = [pygame.event.wait(max(1, int(wait * 1000)))]  # NOEVENT on timeout
+
+        profiler.begin_frame()  # The wait above is idle time, not frame work
+        with profiler.phase("events"):
+            events += pygame.event.get()
+
+            mouse_pos = pygame.mouse.get_pos()
+            game.auto_solve_button.check_hover(mouse_pos)
+            game.manual_solve_button.check_hover(mouse_pos)
+            game.new_game_button.check_hover(mouse_pos)
+
+            for event in events:
+
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        game.generate_random_initial_state()
+                    elif event.key == pygame.K_UP:  # Speed up
+                        game.adjust_speed(True)
+                    elif event.key == pygame.K_DOWN:  # Slow down
+                        game.adjust_speed(False)
+                    elif event.key == pygame.K_t:  # Turbo auto-solve on/off
+                        game.set_turbo(not game.turbo)
+                    elif event.key == pygame.K_h:  # Show the next optimal move
+                        game.show_hint = not game.show_hint
+                    elif event.key == pygame.K_p:  # Performance overlay on/off
+                        show_profile = not show_profile
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    game.handle_click(mouse_pos, event)
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        game.generate_random_initial_state()
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    game.handle_click(mouse_pos, event)
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    game.invalidate()
+
+        with profiler.phase("update"):
+            game.update()
+
+        with profiler.phase("draw"):
+            dirty = game.draw(screen)
+            if show_profile:
+                now = time.time()
+                if now - profile_refresh_time >= PROFILE_REFRESH:
+                    profile_lines = profile_overlay_lines(profiler)
+                    profile_refresh_time = now
+                # Redrawn every frame: repainted pole columns reach down into the overlay area
+                dirty.append(draw_profile_overlay(screen, game.font, profile_lines))
+            elif profile_shown:
+                dirty.append(draw_profile_overlay(screen, game.font, None))
+            profile_shown = show_profile
+
+        with profiler.phase("flip"):
+            if dirty:
+                pygame.display.update(dirty)
+
+        profiler.end_frame(game.solver_time)
+        game.solver_time = 0.0
+        clock.tick(60)  # Frame rate cap while auto-solving; turbo plays many moves per frame
+
+    if profile_path:
+        profiler.export(profile_path)
+        print(f"Frame profile: {len(profiler.samples)} frames written to {profile_path}")
     pygame.quit()
     sys.exit()
 # -------------------------------------------------------------------------------------
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
 # ---------------------------------END-------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,60 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Bulk random puzzle generation for simulations and test fixtures.
+# Every assignment of disks to poles is a valid state (the stacking order follows from the
+# sizes), so a uniform state is a uniform base-P index in [0, P^n). Batches are drawn as
+# NumPy arrays of indices and converted to packed codes (see hanoi_state.py) in one pass.
+# The single-state version is StateCodec.random_code, which needs no NumPy.
+# Usage: python hanoi_random.py [disk_count] [pole_count] [count]
+# -------------------------------------------------------------------------------------
+import sys
+import time
+
+import numpy as np
+
+from hanoi_bfs import BATCH_SIZE, pole_powers
+from hanoi_state import StateCodec
+# -------------------------------------------------------------------------------------
+def random_indices(disk_count: int, pole_count: int, count: int, rng: np.random.Generator = None,
+                   exclude_goal: bool = False) -> np.ndarray:
+    """`count` uniform base-P state indices (int64), optionally never the goal state (index P^n - 1)"""
+    if pole_count ** disk_count > np.iinfo(np.int64).max:
+        raise ValueError("State indices do not fit in int64")
+    rng = rng or np.random.default_rng()
+    state_count = pole_count ** disk_count
+    return rng.integers(0, state_count - 1 if exclude_goal else state_count, size=count, dtype=np.int64)
+# -------------------------------------------------------------------------------------
+def indices_to_codes(indices: np.ndarray, disk_count: int, pole_count: int) -> np.ndarray:
+    """Vectorized StateCodec.from_index, BATCH_SIZE states at a time to bound the digit arrays"""
+    codec = StateCodec(disk_count, pole_count)
+    if codec.bits * disk_count > 63:
+        raise ValueError("Packed codes do not fit in int64")
+    powers = pole_powers(disk_count, pole_count)
+    shifts = np.arange(disk_count, dtype=np.int64) * codec.bits
+    codes = np.empty(len(indices), dtype=np.int64)
+    for begin in range(0, len(indices), BATCH_SIZE):
+        digits = (indices[begin:begin + BATCH_SIZE, None] // powers) % pole_count
+        codes[begin:begin + BATCH_SIZE] = np.bitwise_or.reduce(digits << shifts, axis=1)
+    return codes
+# -------------------------------------------------------------------------------------
+def random_codes(disk_count: int, pole_count: int, count: int, rng: np.random.Generator = None,
+                 exclude_goal: bool = False) -> np.ndarray:
+    """`count` uniform packed states (int64), e.g. millions of puzzles for a simulation"""
+    return indices_to_codes(random_indices(disk_count, pole_count, count, rng, exclude_goal), disk_count, pole_count)
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    poles = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    total = int(sys.argv[3]) if len(sys.argv) > 3 else 10_000_000
+
+    started = time.time()
+    sample = random_codes(disks, poles, total, np.random.default_rng(0), exclude_goal=True)
+    elapsed = time.time() - started
+    print(f"{poles} poles, {disks} disks: {total} states in {elapsed:.2f}s ({total / elapsed:.0f} states/s)")
+
+    # Uniformity check on a small instance: every state about equally frequent
+    counts = np.bincount(random_indices(4, poles, 1_000_000, np.random.default_rng(1)), minlength=poles ** 4)
+    print(f"4 disks, {poles ** 4} states: counts between {counts.min()} and {counts.max()} "
+          f"(expected {1_000_000 / poles ** 4:.0f} each)")
+# ---------------------------------END-------------------------------------------------
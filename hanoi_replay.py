@@ -0,0 +1,212 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Compact binary replays of games and auto-solve runs.
+# A move is its index among the P * (P - 1) ordered (source, target) pairs, packed into
+# a little-endian bit stream: 3 bits per move for 3 poles (6 moves), 4 for 4 poles, 5 for 5.
+# File layout:
+#   header       magic, version, pole/disk count, bits per move, checkpoint interval,
+#                move count, start state (packed code, see hanoi_state.py)
+#   moves        ceil(move_count * bits / 8) bytes
+#   checkpoints  the packed state after every checkpoint_interval moves (0, K, 2K, ...)
+# Playback memory-maps the file: seeking to move k starts from checkpoint k // K and replays
+# fewer than K moves, so any position of a multi-million move replay is reached at once.
+# Usage: python hanoi_replay.py [disk_count] [replay_path]
+# -------------------------------------------------------------------------------------
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from typing import Iterator, Sequence, Tuple
+
+from hanoi_state import State, StateCodec
+
+MAGIC = b"HNRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBIQ")  # magic, version, poles, disks, bits per move, checkpoint interval, moves
+CHECKPOINT_INTERVAL = 1024  # Moves between two stored states; seeking replays at most this many
+# -------------------------------------------------------------------------------------
+def move_bits(pole_count: int) -> int:
+    """Bits per move: enough for the P * (P - 1) ordered (source, target) pairs"""
+    return (pole_count * (pole_count - 1) - 1).bit_length()
+# -------------------------------------------------------------------------------------
+def state_bytes(codec: StateCodec) -> int:
+    """Bytes per stored packed state"""
+    return (codec.bits * codec.disk_count + 7) // 8
+# -------------------------------------------------------------------------------------
+class ReplayWriter:
+    """
+    Records a replay move by move (ValueError on an illegal move). The file is written under
+    a temporary name and renamed by close(), so readers never see a partial replay.
+    """
+    def __init__(self, path: str, poles: Sequence[Sequence[int]], disk_count: int,
+                 checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        self.path = path
+        self.codec = StateCodec(disk_count, len(poles))
+        self.bits = move_bits(self.codec.pole_count)
+        self.checkpoint_interval = checkpoint_interval
+        self.start = self.code = self.codec.encode(poles)
+        self.move_count = 0
+        self.checkpoints = [self.start]
+
+        # Move index of every (source, target) pair: source * (P - 1) + target, skipping target == source
+        pole_count = self.codec.pole_count
+        self.move_codes = {(src, dst): src * (pole_count - 1) + dst - (dst > src)
+                           for src in range(pole_count) for dst in range(pole_count) if src != dst}
+        self.pending = 0  # Bits not yet written, lowest first
+        self.pending_bits = 0
+
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.tmp_path, 'wb')
+        self.file.write(self.header())
+    # ----------------------------------------
+    def header(self) -> bytes:
+        return HEADER.pack(MAGIC, VERSION, self.codec.pole_count, self.codec.disk_count, self.bits,
+                           self.checkpoint_interval, self.move_count) + \
+            self.start.to_bytes(state_bytes(self.codec), 'little')
+    # ----------------------------------------
+    def append(self, src: int, dst: int):
+        self.code = self.codec.apply_move(self.code, src, dst)
+        self.pending |= self.move_codes[src, dst] << self.pending_bits
+        self.pending_bits += self.bits
+        if self.pending_bits >= 64:
+            self.file.write((self.pending & 0xFFFFFFFFFFFFFFFF).to_bytes(8, 'little'))
+            self.pending >>= 64
+            self.pending_bits -= 64
+
+        self.move_count += 1
+        if self.move_count % self.checkpoint_interval == 0:
+            self.checkpoints.append(self.code)
+    # ----------------------------------------
+    def close(self):
+        """Flush the moves, append the checkpoints, fill in the move count and publish the file"""
+        self.file.write(self.pending.to_bytes((self.pending_bits + 7) // 8, 'little'))
+        size = state_bytes(self.codec)
+        self.file.write(b"".join(code.to_bytes(size, 'little') for code in self.checkpoints))
+        self.file.seek(0)
+        self.file.write(self.header())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+    # ----------------------------------------
+    def __enter__(self):
+        return self
+    # ----------------------------------------
+    def __exit__(self, *exc_info):
+        self.close()
+# -------------------------------------------------------------------------------------
+class ReplayReader:
+    """Memory-mapped replay: random access to every move and to the state after any move"""
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, pole_count, disk_count, self.bits, self.checkpoint_interval, self.move_count = \
+            HEADER.unpack_from(self.mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Hanoi replay")
+
+        self.codec = StateCodec(disk_count, pole_count)
+        self.disk_count = disk_count
+        self.pole_count = pole_count
+        self.state_size = state_bytes(self.codec)
+        self.moves_offset = HEADER.size + self.state_size
+        self.checkpoints_offset = self.moves_offset + (self.move_count * self.bits + 7) // 8
+        self.start = self.checkpoint(0)
+
+        self.move_pairs = [(src, dst) for src in range(pole_count) for dst in range(pole_count) if src != dst]
+        self.move_mask = (1 << self.bits) - 1
+    # ----------------------------------------
+    def __len__(self) -> int:
+        return self.move_count
+    # ----------------------------------------
+    def checkpoint(self, index: int) -> int:
+        """Packed state after index * checkpoint_interval moves"""
+        offset = self.checkpoints_offset + index * self.state_size
+        return int.from_bytes(self.mmap[offset:offset + self.state_size], 'little')
+    # ----------------------------------------
+    def move(self, index: int) -> Tuple[int, int]:
+        """The (source, target) of move `index` (0-based)"""
+        if not 0 <= index < self.move_count:
+            raise IndexError(f"Move {index} out of range (replay has {self.move_count} moves)")
+        bit = index * self.bits
+        offset = self.moves_offset + (bit >> 3)
+        value = int.from_bytes(self.mmap[offset:offset + 2], 'little')  # A move never spans more than 2 bytes
+        return self.move_pairs[(value >> (bit & 7)) & self.move_mask]
+    # ----------------------------------------
+    def iter_moves(self, start: int = 0, stop: int = None) -> Iterator[Tuple[int, int]]:
+        """Yield the moves start..stop - 1, reading the bit stream sequentially"""
+        stop = self.move_count if stop is None else min(stop, self.move_count)
+        bits, mask, pairs = self.bits, self.move_mask, self.move_pairs
+        index = start
+        while index < stop:
+            # Decode one chunk of whole bytes at a time
+            chunk_stop = min(stop, index + 4096)
+            first_bit = index * bits
+            begin = self.moves_offset + (first_bit >> 3)
+            end = self.moves_offset + (chunk_stop * bits + 7) // 8
+            value = int.from_bytes(self.mmap[begin:end], 'little') >> (first_bit & 7)
+            for _ in range(chunk_stop - index):
+                yield pairs[value & mask]
+                value >>= bits
+            index = chunk_stop
+    # ----------------------------------------
+    def state_code_after(self, move_count: int) -> int:
+        """Packed state after the first move_count moves: nearest checkpoint, then fewer than K moves"""
+        if not 0 <= move_count <= self.move_count:
+            raise IndexError(f"Position {move_count} out of range (replay has {self.move_count} moves)")
+        checkpoint = move_count // self.checkpoint_interval
+        code = self.checkpoint(checkpoint)
+        for src, dst in self.iter_moves(checkpoint * self.checkpoint_interval, move_count):
+            code = self.codec.apply_move(code, src, dst)
+        return code
+    # ----------------------------------------
+    def state_after(self, move_count: int) -> State:
+        """Tuple-of-tuples state (disk sizes bottom to top per pole) after the first move_count moves"""
+        return self.codec.decode(self.state_code_after(move_count))
+    # ----------------------------------------
+    def close(self):
+        self.mmap.close()
+# -------------------------------------------------------------------------------------
+def write_replay(path: str, poles: Sequence[Sequence[int]], disk_count: int, moves,
+                 checkpoint_interval: int = CHECKPOINT_INTERVAL) -> int:
+    """Record a whole (src, dst) move iterable from the given state; returns the move count"""
+    with ReplayWriter(path, poles, disk_count, checkpoint_interval) as writer:
+        for src, dst in moves:
+            writer.append(src, dst)
+    return writer.move_count
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    import hanoi_solver
+
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    replay_path = sys.argv[2] if len(sys.argv) > 2 else f"hanoi_{disks}d.replay"
+
+    # Record the optimal solution of a random 3-pole puzzle
+    rng = random.Random(0)
+    state_codec = StateCodec(disks)
+    puzzle = state_codec.decode(state_codec.random_code(rng, exclude_goal=True))
+    started = time.time()
+    total = write_replay(replay_path, puzzle, disks, hanoi_solver.iter_optimal_moves(puzzle, disks))
+    size = os.path.getsize(replay_path)
+    print(f"{total} moves written to {replay_path} in {time.time() - started:.2f}s: "
+          f"{size} bytes ({8 * size / max(1, total):.2f} bits per move)")
+
+    # Seek to random positions and check them against a straight replay of the move stream
+    replay = ReplayReader(replay_path)
+    positions = sorted(rng.randrange(total + 1) for _ in range(100))
+    started = time.time()
+    seeks = {position: replay.state_code_after(position) for position in positions}
+    print(f"{len(positions)} seeks in {time.time() - started:.4f}s")
+
+    code, played = replay.start, 0
+    for position in positions:
+        for src, dst in replay.iter_moves(played, position):
+            code = replay.codec.apply_move(code, src, dst)
+        played = position
+        assert code == seeks[position], position
+    assert replay.state_code_after(total) == replay.codec.goal()
+    print("All seeks match the sequential replay and the last state is solved")
+    replay.close()
+# ---------------------------------END-------------------------------------------------
@@ -0,0 +1,316 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Solvers for the Tower of Hanoi variant (any valid initial state, goal is the rightmost pole).
+# No pygame dependency, so the solvers can be used (and checked) without a display.
+# States are given the same way the game stores them: one sequence of disk sizes per pole,
+# bottom to top, e.g. ((3, 1), (2,), ()) for 3 disks.
+# Run this file directly to check the closed-form solver against BFS for small disk counts.
+# -------------------------------------------------------------------------------------
+import collections
+import itertools
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from hanoi_state import StateCodec
+
+POLE_COUNT = 3
+
+State = Tuple[Tuple[int, ...], ...]
+# -------------------------------------------------------------------------------------
+def disk_pegs(poles: Sequence[Sequence[int]], disk_count: int) -> List[int]:
+    """Return the pole index of every disk, indexed by disk size - 1"""
+    pegs = [-1] * disk_count
+    for pole_idx, pole in enumerate(poles):
+        for size in pole:
+            pegs[size - 1] = pole_idx
+    return pegs
+# -------------------------------------------------------------------------------------
+def goal_state(disk_count: int, pole_count: int = POLE_COUNT) -> State:
+    """All disks stacked on the rightmost pole, largest at the bottom"""
+    return tuple(() for _ in range(pole_count - 1)) + (tuple(range(disk_count, 0, -1)),)
+# -------------------------------------------------------------------------------------
+def optimal_move_count(poles: Sequence[Sequence[int]], disk_count: int, goal_pole: int = POLE_COUNT - 1) -> int:
+    """
+    Minimal number of moves from any valid 3-pole state to all disks on goal_pole.
+    Walks the disks from largest to smallest: a disk already on the current target costs
+    nothing; otherwise it must move once and the smaller disks first gather on the third
+    pole, which costs 2^(size-1) moves in total and makes that third pole the new target.
+    """
+    if len(poles) != 3:
+        raise ValueError("Closed-form solver only supports 3 poles")
+
+    pegs = disk_pegs(poles, disk_count)
+    target = goal_pole
+    moves = 0
+    for size in range(disk_count, 0, -1):
+        peg = pegs[size - 1]
+        if peg != target:
+            moves += 1 << (size - 1)
+            target = 3 - peg - target  # The pole that is neither source nor target
+    return moves
+# -------------------------------------------------------------------------------------
+def iter_tower_moves(disk_count: int, src: int, dst: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the 2^n - 1 moves of the classic puzzle (whole tower from src to dst), one at a time.
+    Move i goes from pole (i & (i - 1)) % 3 to ((i | (i - 1)) + 1) % 3 of a fixed labelling;
+    that labelling sends the tower to its third pole for odd n and its second pole for even n.
+    """
+    spare = 3 - src - dst
+    labels = (src, spare, dst) if disk_count % 2 else (src, dst, spare)
+    for i in range(1, 1 << disk_count):
+        yield labels[(i & (i - 1)) % 3], labels[((i | (i - 1)) + 1) % 3]
+# -------------------------------------------------------------------------------------
+def iter_optimal_moves(poles: Sequence[Sequence[int]], disk_count: int,
+                       goal_pole: int = POLE_COUNT - 1) -> Iterator[Tuple[int, int]]:
+    """
+    Lazily yield the optimal (src, dst) moves from any valid 3-pole state to goal_pole.
+    Uses O(n) memory: the same largest-to-smallest walk as optimal_move_count records each
+    disk that has to move, then, smallest first, yields that disk's move followed by the
+    classic tower moves that bring the smaller disks back on top of it.
+    """
+    if len(poles) != 3:
+        raise ValueError("Closed-form solver only supports 3 poles")
+
+    pegs = disk_pegs(poles, disk_count)
+    target = goal_pole
+    pending = []  # (size, src, dst, spare) for every disk that must move, largest first
+    for size in range(disk_count, 0, -1):
+        peg = pegs[size - 1]
+        if peg != target:
+            spare = 3 - peg - target
+            pending.append((size, peg, target, spare))
+            target = spare  # Smaller disks must gather on the spare pole first
+
+    for size, src, dst, spare in reversed(pending):
+        yield src, dst
+        yield from iter_tower_moves(size - 1, spare, dst)
+# -------------------------------------------------------------------------------------
+def next_optimal_move(poles: Sequence[Sequence[int]], disk_count: int,
+                      goal_pole: int = POLE_COUNT - 1) -> Optional[Tuple[int, int]]:
+    """
+    First move of iter_optimal_moves in O(n) time and O(1) extra memory, or None when solved:
+    the move of the smallest disk that the largest-to-smallest walk finds out of place.
+    """
+    if len(poles) != 3:
+        raise ValueError("Closed-form solver only supports 3 poles")
+
+    pegs = disk_pegs(poles, disk_count)
+    target = goal_pole
+    move = None
+    for size in range(disk_count, 0, -1):
+        peg = pegs[size - 1]
+        if peg != target:
+            move = (peg, target)
+            target = 3 - peg - target
+    return move
+# -------------------------------------------------------------------------------------
+def state_after_optimal_moves(poles: Sequence[Sequence[int]], disk_count: int, move_count: int,
+                              goal_pole: int = POLE_COUNT - 1) -> State:
+    """
+    State after the first move_count moves of iter_optimal_moves, in O(n) without playing them.
+    The solution is one segment of 2^(size-1) moves per disk that must move, smallest first:
+    when a segment starts, the larger disks are still where they began and the smaller ones
+    are stacked on its spare pole; then the disk moves and the smaller tower follows it.
+    Inside a classic tower, the largest disk has moved once half of its moves are played.
+    """
+    if len(poles) != 3:
+        raise ValueError("Closed-form solver only supports 3 poles")
+
+    pegs = disk_pegs(poles, disk_count)
+    target = goal_pole
+    pending = []  # (size, src, dst, spare) for every disk that must move, largest first
+    for size in range(disk_count, 0, -1):
+        peg = pegs[size - 1]
+        if peg != target:
+            spare = 3 - peg - target
+            pending.append((size, peg, target, spare))
+            target = spare
+
+    total = sum(1 << (size - 1) for size, _, _, _ in pending)
+    if not 0 <= move_count <= total:
+        raise ValueError(f"Move {move_count} is out of range (the solution has {total} moves)")
+
+    if move_count == total:
+        pegs = [goal_pole] * disk_count
+    else:
+        # Find the segment holding the move; it exists since move_count < total
+        for size, src, dst, spare in reversed(pending):
+            if move_count < 1 << (size - 1):
+                break
+            move_count -= 1 << (size - 1)
+
+        # Disks larger than `size` have not moved yet; the smaller ones start as a tower on the spare pole
+        if move_count == 0:
+            pegs[:size - 1] = [spare] * (size - 1)
+        else:
+            pegs[size - 1] = dst
+            tower_src, tower_dst = spare, dst
+            move_count -= 1
+            for smaller in range(size - 1, 0, -1):
+                half = 1 << (smaller - 1)
+                tower_spare = 3 - tower_src - tower_dst
+                if move_count < half:
+                    pegs[smaller - 1] = tower_src
+                    tower_dst = tower_spare  # Its smaller disks are still on their way to the spare pole
+                else:
+                    pegs[smaller - 1] = tower_dst
+                    move_count -= half
+                    tower_src = tower_spare  # ... or already there, and now follow it
+
+    state = [[] for _ in range(3)]
+    for size in range(disk_count, 0, -1):
+        state[pegs[size - 1]].append(size)
+    return tuple(tuple(pole) for pole in state)
+# -------------------------------------------------------------------------------------
+def bfs_optimal_move_count(poles: Sequence[Sequence[int]], disk_count: int) -> int:
+    """
+    Minimal number of moves to the rightmost pole using BFS over the full state space.
+    Exponential in disk_count; kept as the verification oracle for the closed-form solver.
+    """
+    codec = StateCodec(disk_count, len(poles))
+    initial_state = codec.encode(poles)
+    goal = codec.goal()
+
+    # If already in goal state, no moves needed
+    if initial_state == goal:
+        return 0
+
+    # BFS setup (states are packed ints, see hanoi_state.py)
+    queue = collections.deque([(initial_state, 0)])
+    visited = {initial_state}
+
+    while queue:
+        current_state, moves = queue.popleft()
+
+        # Generate all possible next states
+        for _, _, new_state in codec.successors(current_state):
+            if new_state == goal:
+                return moves + 1
+
+            # If we haven't seen this state before
+            if new_state not in visited:
+                visited.add(new_state)
+                queue.append((new_state, moves + 1))
+
+    return -1  # Should never happen for valid initial states
+# -------------------------------------------------------------------------------------
+def path_length(state: int, parents: dict) -> int:
+    """Number of parent links from state back to the root of its search tree"""
+    length = 0
+    while parents[state] is not None:
+        state = parents[state][0]
+        length += 1
+    return length
+# -------------------------------------------------------------------------------------
+def check_state(poles: Sequence[Sequence[int]], disk_count: int, pole_count: int, name: str = "state"):
+    """Raise ValueError unless poles holds disks 1..disk_count once each, larger below smaller, on pole_count poles"""
+    if len(poles) != pole_count:
+        raise ValueError(f"The {name} has {len(poles)} poles, expected {pole_count}")
+    if sorted(size for pole in poles for size in pole) != list(range(1, disk_count + 1)):
+        raise ValueError(f"The {name} must hold each of the disks 1 to {disk_count} exactly once")
+    for pole in poles:
+        if any(lower <= upper for lower, upper in zip(pole, pole[1:])):
+            raise ValueError(f"The {name} has a larger disk on a smaller one: {tuple(pole)}")
+# -------------------------------------------------------------------------------------
+def bidirectional_solution(start: Sequence[Sequence[int]], goal: Sequence[Sequence[int]],
+                           disk_count: int) -> List[Tuple[int, int]]:
+    """
+    Shortest (src, dst) move list between any two valid states, for any pole count.
+    Grows a BFS from each end, always expanding a full layer of the smaller side, and stops
+    after the first layer in which the two searches meet, keeping the shortest junction.
+    Each side only reaches about half the solution depth, e.g. 0.8s instead of 10s for a
+    one-sided BFS on 10 disks and 4 poles.
+    Raises ValueError when either state is not a valid state of the same puzzle.
+    """
+    check_state(start, disk_count, len(start), "start")
+    check_state(goal, disk_count, len(start), "goal")
+    codec = StateCodec(disk_count, len(start))
+    start_code = codec.encode(start)
+    goal_code = codec.encode(goal)
+    if start_code == goal_code:
+        return []
+
+    # state -> (neighbour towards that side's root, move as played from start to goal)
+    forward = {start_code: None}
+    backward = {goal_code: None}
+    forward_layer, backward_layer = [start_code], [goal_code]
+    forward_depth = backward_depth = 0
+
+    best = None  # (total length, meeting state)
+    while forward_layer and backward_layer and best is None:
+        expand_forward = len(forward_layer) <= len(backward_layer)
+        if expand_forward:
+            layer, parents, others, depth = forward_layer, forward, backward, forward_depth + 1
+        else:
+            layer, parents, others, depth = backward_layer, backward, forward, backward_depth + 1
+
+        next_layer = []
+        for state in layer:
+            for src, dst, new_state in codec.successors(state):
+                if new_state in parents:
+                    continue
+                # Moves are stored in start-to-goal direction on both sides
+                parents[new_state] = (state, (src, dst) if expand_forward else (dst, src))
+                next_layer.append(new_state)
+                if new_state in others:
+                    total = depth + path_length(new_state, others)
+                    if best is None or total < best[0]:
+                        best = (total, new_state)
+
+        if expand_forward:
+            forward_layer, forward_depth = next_layer, depth
+        else:
+            backward_layer, backward_depth = next_layer, depth
+
+    if best is None:
+        return []  # Should never happen for valid states
+
+    # Walk from the meeting state back to the start, then forward to the goal
+    meeting = best[1]
+    moves = []
+    state = meeting
+    while forward[state] is not None:
+        state, move = forward[state]
+        moves.append(move)
+    moves.reverse()
+    state = meeting
+    while backward[state] is not None:
+        state, move = backward[state]
+        moves.append(move)
+    return moves
+# -------------------------------------------------------------------------------------
+def all_states(disk_count: int, pole_count: int = POLE_COUNT):
+    """Yield every valid state: each disk on any pole, stacked largest to smallest"""
+    for pegs in itertools.product(range(pole_count), repeat=disk_count):
+        poles = [[] for _ in range(pole_count)]
+        for size in range(disk_count, 0, -1):
+            poles[pegs[size - 1]].append(size)
+        yield tuple(tuple(pole) for pole in poles)
+# -------------------------------------------------------------------------------------
+def verify_against_bfs(max_disks: int = 6) -> None:
+    """Compare the closed-form solvers with BFS for every state up to max_disks"""
+    for disk_count in range(1, max_disks + 1):
+        goal = goal_state(disk_count)
+        for state in all_states(disk_count):
+            expected = bfs_optimal_move_count(state, disk_count)
+            actual = optimal_move_count(state, disk_count)
+            if actual != expected:
+                raise AssertionError(f"{state}: closed form {actual}, BFS {expected}")
+
+            # Replay the move stream and check it is legal, optimal and ends in the goal
+            poles = [list(pole) for pole in state]
+            move_count = 0
+            for src, dst in iter_optimal_moves(state, disk_count):
+                if not poles[src] or (poles[dst] and poles[dst][-1] < poles[src][-1]):
+                    raise AssertionError(f"{state}: illegal move {src}->{dst}")
+                poles[dst].append(poles[src].pop())
+                move_count += 1
+                if state_after_optimal_moves(state, disk_count, move_count) != tuple(tuple(pole) for pole in poles):
+                    raise AssertionError(f"{state}: wrong state after move {move_count}")
+            if move_count != expected or tuple(tuple(pole) for pole in poles) != goal:
+                raise AssertionError(f"{state}: move stream does not reach the goal optimally")
+        print(f"{disk_count} disks: {3 ** disk_count} states OK")
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    verify_against_bfs()
+# ---------------------------------END-------------------------------------------------
@@ -0,0 +1,137 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Packed integer encoding of Tower of Hanoi states, shared by all solvers.
+# A state is one Python int holding the pole of every disk in a fixed-width bit field:
+# disk of size s lives in bits [(s - 1) * b, s * b), where b = 2 bits for 3 or 4 poles
+# (3 bits for up to 8 poles). Only valid states exist in this form, since the stacking
+# order on a pole always follows from the disk sizes.
+# Top-disk lookup and move application work directly on the packed int with a few
+# bit operations, so solvers never rebuild lists or tuples while searching.
+# -------------------------------------------------------------------------------------
+import random
+from typing import Iterator, List, Sequence, Tuple
+
+State = Tuple[Tuple[int, ...], ...]
+# -------------------------------------------------------------------------------------
+class StateCodec:
+    def __init__(self, disk_count: int, pole_count: int = 3):
+        if not 2 <= pole_count <= 8:
+            raise ValueError("Pole count must be between 2 and 8")
+        self.disk_count = disk_count
+        self.pole_count = pole_count
+        self.bits = max(1, (pole_count - 1).bit_length())  # Bits per disk field
+        self.field_mask = (1 << self.bits) - 1
+
+        # Lowest bit of every disk field, e.g. 0b0101...01 for 2-bit fields
+        self.low_bits = 0
+        for disk in range(disk_count):
+            self.low_bits |= 1 << (disk * self.bits)
+
+        # Every field set to the same pole, used to find the disks on that pole
+        self.pole_patterns = [self.low_bits * pole for pole in range(pole_count)]
+    # ----------------------------------------
+    def encode(self, poles: Sequence[Sequence[int]]) -> int:
+        """Pack a tuple-of-tuples state (disk sizes bottom to top per pole)"""
+        code = 0
+        for pole_idx, pole in enumerate(poles):
+            for size in pole:
+                code |= pole_idx << ((size - 1) * self.bits)
+        return code
+    # ----------------------------------------
+    def encode_pegs(self, pegs: Sequence[int]) -> int:
+        """Pack a list holding the pole of each disk (index 0 = smallest disk)"""
+        code = 0
+        for disk, pole in enumerate(pegs):
+            code |= pole << (disk * self.bits)
+        return code
+    # ----------------------------------------
+    def decode(self, code: int) -> State:
+        """Unpack to a tuple of tuples of disk sizes (bottom to top) per pole"""
+        poles = [[] for _ in range(self.pole_count)]
+        for size in range(self.disk_count, 0, -1):
+            poles[self.pole_of(code, size)].append(size)
+        return tuple(tuple(pole) for pole in poles)
+    # ----------------------------------------
+    def decode_pegs(self, code: int) -> List[int]:
+        """Unpack to the pole of each disk (index 0 = smallest disk)"""
+        return [self.pole_of(code, size) for size in range(1, self.disk_count + 1)]
+    # ----------------------------------------
+    def index(self, code: int) -> int:
+        """Dense base-P rank of the state in [0, P^n), e.g. for indexing flat distance tables"""
+        index = 0
+        for size in range(self.disk_count, 0, -1):
+            index = index * self.pole_count + self.pole_of(code, size)
+        return index
+    # ----------------------------------------
+    def from_index(self, index: int) -> int:
+        """Inverse of index()"""
+        code = 0
+        for disk in range(self.disk_count):
+            index, pole = divmod(index, self.pole_count)
+            code |= pole << (disk * self.bits)
+        return code
+    # ----------------------------------------
+    def random_code(self, rng=random, exclude_goal: bool = False) -> int:
+        """
+        Uniform sample over all P^n valid states (every disk independently on any pole),
+        optionally excluding the goal state
+        """
+        goal_index = self.pole_count ** self.disk_count - 1  # Every digit on the rightmost pole
+        while True:
+            index = rng.randrange(self.pole_count ** self.disk_count)
+            if not (exclude_goal and index == goal_index):
+                return self.from_index(index)
+    # ----------------------------------------
+    def goal(self, goal_pole: int = -1) -> int:
+        """All disks on goal_pole (default: rightmost)"""
+        return self.pole_patterns[goal_pole]
+    # ----------------------------------------
+    def pole_of(self, code: int, size: int) -> int:
+        return (code >> ((size - 1) * self.bits)) & self.field_mask
+    # ----------------------------------------
+    def pole_mask(self, code: int, pole: int) -> int:
+        """Low bit of every disk field whose disk sits on the given pole"""
+        # Fields equal to `pole` become zero after the XOR; collapse each field to its low bit
+        diff = code ^ self.pole_patterns[pole]
+        nonzero = diff
+        for shift in range(1, self.bits):
+            nonzero |= diff >> shift
+        return self.low_bits & ~nonzero
+    # ----------------------------------------
+    def top_disk(self, code: int, pole: int) -> int:
+        """Size of the top (smallest) disk on the pole, or 0 if the pole is empty"""
+        mask = self.pole_mask(code, pole)
+        if not mask:
+            return 0
+        return ((mask & -mask).bit_length() - 1) // self.bits + 1
+    # ----------------------------------------
+    def top_disks(self, code: int) -> List[int]:
+        return [self.top_disk(code, pole) for pole in range(self.pole_count)]
+    # ----------------------------------------
+    def move(self, code: int, size: int, src: int, dst: int) -> int:
+        """Move the disk of the given size from src to dst (no legality check)"""
+        return code ^ ((src ^ dst) << ((size - 1) * self.bits))
+    # ----------------------------------------
+    def apply_move(self, code: int, src: int, dst: int) -> int:
+        """Apply a (src, dst) move, raising ValueError if it is not legal"""
+        size = self.top_disk(code, src)
+        if not size:
+            raise ValueError(f"No disk on pole {src}")
+        top = self.top_disk(code, dst)
+        if top and top < size:
+            raise ValueError(f"Cannot place disk {size} on disk {top}")
+        return self.move(code, size, src, dst)
+    # ----------------------------------------
+    def successors(self, code: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield (src, dst, new_code) for every legal move"""
+        tops = self.top_disks(code)
+        for src in range(self.pole_count):
+            size = tops[src]
+            if not size:  # No disks to move from this pole
+                continue
+            shift = (size - 1) * self.bits
+            for dst in range(self.pole_count):
+                if dst != src and (not tops[dst] or tops[dst] > size):
+                    yield src, dst, code ^ ((src ^ dst) << shift)
+# ---------------------------------END-------------------------------------------------
@@ -0,0 +1,191 @@
+# -------------------------------------------------------------------------------------
+# Fadil Eldin
+# October 16 2026
+# Offline batch verifier and scorer for submitted solutions.
+# Thousands of move sequences are replayed together with NumPy instead of one by one through
+# HanoiCore.move_disk: each step applies move t of every sequence at once on a (sequences, disks)
+# array holding the pole of every disk. Sequences are sorted by length, so the sequences still
+# playing at step t are always a prefix of the batch.
+# For every sequence it reports the first illegal move, the final state (packed code, see
+# hanoi_state.py), the number of moves played and the HanoiCore.calculate_user_score percentage.
+# Usage: python hanoi_verify.py [disk_count] [pole_count] [sequence_count]
+# -------------------------------------------------------------------------------------
+import random
+import sys
+import time
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from hanoi_bfs import pole_powers
+from hanoi_state import StateCodec
+# -------------------------------------------------------------------------------------
+def pack_moves(sequences: Sequence[Sequence[Tuple[int, int]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad (src, dst) move lists into a (sequences, longest, 2) int8 array, plus the length of each"""
+    lengths = np.array([len(moves) for moves in sequences], dtype=np.int64)
+    moves = np.zeros((len(sequences), int(lengths.max(initial=0)), 2), dtype=np.int8)
+    for row, sequence in enumerate(sequences):
+        if len(sequence):
+            moves[row, :len(sequence)] = sequence
+    return moves, lengths
+# -------------------------------------------------------------------------------------
+def optimal_counts(pegs: np.ndarray, disk_count: int, pole_count: int) -> np.ndarray:
+    """
+    Optimal move count to the rightmost pole for a (states, disks) array of disk poles:
+    the closed form of hanoi_solver.optimal_move_count on whole columns for 3 poles, the distance
+    table (see hanoi_distance_table.py) for 4+ poles, ValueError when the board is too large for one.
+    """
+    if pole_count != 3:
+        import hanoi_distance_table
+        if not hanoi_distance_table.table_fits(disk_count, pole_count):
+            raise ValueError(f"{pole_count} poles support at most "
+                             f"{hanoi_distance_table.max_table_disks(pole_count)} disks")
+        table = hanoi_distance_table.get_table(disk_count, pole_count)
+        indices = pegs.astype(np.int64) @ pole_powers(disk_count, pole_count)
+        return np.asarray(table.distances)[indices].astype(np.int64)
+
+    if disk_count > 62:
+        raise ValueError("Move counts do not fit in int64")
+    target = np.full(len(pegs), pole_count - 1, dtype=np.int64)
+    moves = np.zeros(len(pegs), dtype=np.int64)
+    for size in range(disk_count, 0, -1):
+        peg = pegs[:, size - 1].astype(np.int64)
+        out_of_place = peg != target
+        moves += out_of_place.astype(np.int64) << (size - 1)
+        target = np.where(out_of_place, 3 - peg - target, target)
+    return moves
+# -------------------------------------------------------------------------------------
+def verify_batch(starts: np.ndarray, moves: np.ndarray, lengths: np.ndarray, disk_count: int,
+                 pole_count: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Replay move sequences from packed start states, all at once.
+    starts: (k,) packed codes; moves: (k, longest, 2) source and target poles; lengths: (k,).
+    A sequence stops at its first illegal move (no disk on the source, a larger disk onto a smaller
+    one, or a pole out of range). Returns arrays indexed like `starts`:
+      first_illegal  index of the first illegal move, -1 when every move is legal
+      final          packed state after the legal moves
+      moves          number of legal moves played
+      solved_at      moves played when every disk first sat on the rightmost pole, -1 if never
+      optimal        optimal move count from the start state
+      score          calculate_user_score percentage at solved_at (as the game scores its win), 0 if never
+    """
+    codec = StateCodec(disk_count, pole_count)
+    if codec.bits * disk_count > 63:
+        raise ValueError("Packed codes do not fit in int64")
+    count = len(starts)
+    shifts = np.arange(disk_count, dtype=np.int64) * codec.bits
+    pegs = ((np.asarray(starts, dtype=np.int64)[:, None] >> shifts) & codec.field_mask).astype(np.int8)
+    optimal = optimal_counts(pegs, disk_count, pole_count)
+
+    # Longest sequences first: at step t the sequences still playing are rows [0, playing)
+    order = np.argsort(-lengths, kind='stable')
+    pegs = pegs[order]
+    moves = moves[order]
+    sorted_lengths = lengths[order]
+    first_illegal = np.full(count, -1, dtype=np.int64)
+    alive = np.ones(count, dtype=bool)  # No illegal move so far
+    solved_at = np.where((pegs == pole_count - 1).all(axis=1), 0, -1)
+    rows = np.arange(count)
+
+    longest = int(sorted_lengths[0]) if count else 0
+    for step in range(longest):
+        playing = int(np.searchsorted(-sorted_lengths, -step, side='left'))  # Rows with length > step
+        board = pegs[:playing]
+        src = moves[:playing, step, 0]
+        dst = moves[:playing, step, 1]
+        in_range = (src >= 0) & (src < pole_count) & (dst >= 0) & (dst < pole_count) & (src != dst)
+
+        # Smallest disk on each pole (disk_count when empty); digits are ordered smallest disk first
+        on_src = board == src[:, None]
+        on_dst = board == dst[:, None]
+        top_src = np.where(on_src.any(axis=1), on_src.argmax(axis=1), disk_count)
+        top_dst = np.where(on_dst.any(axis=1), on_dst.argmax(axis=1), disk_count)
+        legal = in_range & (top_src < top_dst)
+
+        failed = alive[:playing] & ~legal
+        first_illegal[:playing][failed] = step
+        alive[:playing] &= legal
+        apply = alive[:playing]
+        board[rows[:playing][apply], top_src[apply]] = dst[apply]
+        reached = apply & (solved_at[:playing] < 0) & (board == pole_count - 1).all(axis=1)
+        solved_at[:playing][reached] = step + 1
+
+    played = np.where(first_illegal >= 0, first_illegal, sorted_lengths)
+    final = (pegs.astype(np.int64) << shifts).sum(axis=1)  # Disjoint bit fields: sum == bitwise or
+
+    # Undo the length sort
+    result = {"first_illegal": np.empty_like(first_illegal), "final": np.empty_like(final),
+              "moves": np.empty_like(played), "solved_at": np.empty_like(solved_at)}
+    for name, values in zip(result, (first_illegal, final, played, solved_at)):
+        result[name][order] = values
+    result["optimal"] = optimal
+
+    # Same formula as HanoiCore.calculate_user_score, 100% when the start was already solved
+    ratio = optimal / np.maximum(1, result["solved_at"])
+    score = np.where(optimal > 0, np.minimum(100, (ratio * 100).astype(np.int64)), 100)
+    result["score"] = np.where(result["solved_at"] >= 0, score, 0)
+    return result
+# -------------------------------------------------------------------------------------
+def verify_one(start: int, moves: Sequence[Tuple[int, int]], disk_count: int,
+               pole_count: int = 3) -> Tuple[int, int, int, int]:
+    """Scalar reference: (first illegal move or -1, final packed state, moves played, solved_at)"""
+    codec = StateCodec(disk_count, pole_count)
+    code = start
+    solved_at = 0 if code == codec.goal() else -1
+    for index, (src, dst) in enumerate(moves):
+        if not (0 <= src < pole_count and 0 <= dst < pole_count and src != dst):
+            return index, code, index, solved_at
+        try:
+            code = codec.apply_move(code, src, dst)
+        except ValueError:
+            return index, code, index, solved_at
+        if solved_at < 0 and code == codec.goal():
+            solved_at = index + 1
+    return -1, code, len(moves), solved_at
+# -------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    import hanoi_solver
+
+    disks = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    poles = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    total = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+
+    # Optimal solutions, some with detours (a move and its undo) and some with a random move inserted
+    rng = random.Random(0)
+    codec = StateCodec(disks, poles)
+    start_codes, submissions = [], []
+    for _ in range(total):
+        code = codec.random_code(rng)
+        state = codec.decode(code)
+        if poles == 3:
+            solution = list(hanoi_solver.iter_optimal_moves(state, disks))
+        else:
+            import hanoi_multipeg
+            solution = hanoi_multipeg.astar_solution(state, disks)
+        kind = rng.random()
+        if solution and kind < 0.3:
+            at = rng.randrange(len(solution))
+            src, dst = solution[at]
+            solution[at:at] = [(src, dst), (dst, src)]  # Legal detour: two extra moves
+        elif solution and kind < 0.5:
+            solution.insert(rng.randrange(len(solution)), (rng.randrange(poles), rng.randrange(poles)))
+        start_codes.append(code)
+        submissions.append(solution)
+
+    move_array, move_lengths = pack_moves(submissions)
+    started = time.time()
+    report = verify_batch(np.array(start_codes, dtype=np.int64), move_array, move_lengths, disks, poles)
+    elapsed = time.time() - started
+    print(f"{total} sequences, {int(move_lengths.sum())} moves verified in {elapsed:.3f}s "
+          f"({move_lengths.sum() / elapsed:.0f} moves/s)")
+    print(f"Illegal: {np.count_nonzero(report['first_illegal'] >= 0)} | Solved: {np.count_nonzero(report['solved_at'] >= 0)} | "
+          f"Perfect: {np.count_nonzero(report['score'] == 100)}")
+
+    # Check against the scalar replay
+    started = time.time()
+    for row, (code, sequence) in enumerate(zip(start_codes, submissions)):
+        expected = verify_one(code, sequence, disks, poles)
+        actual = tuple(report[name][row] for name in ("first_illegal", "final", "moves", "solved_at"))
+        assert tuple(map(int, actual)) == expected, (row, actual, expected)
+    print(f"Matches the scalar replay ({time.time() - started:.3f}s one by one)")
+# ---------------------------------END-------------------------------------------------